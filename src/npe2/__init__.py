@@ -11,11 +11,19 @@ __email__ = "talley.lambert@gmail.com"
 from ._dynamic_plugin import DynamicPlugin
 from ._inspection._fetch import fetch_manifest, get_manifest_from_wheel
 from ._plugin_manager import PluginContext, PluginManager
-from .io_utils import read, read_get_reader, write, write_get_writer
+from .io_utils import (
+    convert,
+    read,
+    read_get_reader,
+    read_many,
+    write,
+    write_get_writer,
+)
 from .manifest import PackageMetadata, PluginManifest
 
 __all__ = [
     "__version__",
+    "convert",
     "DynamicPlugin",
     "fetch_manifest",
     "get_manifest_from_wheel",
@@ -24,6 +32,7 @@ __all__ = [
     "PluginManager",
     "PluginManifest",
     "read_get_reader",
+    "read_many",
     "read",
     "write_get_writer",
     "write",
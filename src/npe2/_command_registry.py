@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field, replace
 from functools import partial
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
 
 from psygnal import Signal
 
@@ -11,6 +13,8 @@ from .manifest._validators import DOTTED_NAME_PATTERN
 from .types import PythonName
 
 PDisposable = Callable[[], None]
+# seconds during which a failed import is not retried
+IMPORT_RETRY_DELAY = 30.0
 
 if TYPE_CHECKING:
     from .manifest.schema import PluginManifest
@@ -21,6 +25,10 @@ class CommandHandler:
     id: str
     function: Optional[Callable] = None
     python_name: Optional[PythonName] = None
+    # (time.monotonic(), exception) of the last failed import
+    _failure: Optional[Tuple[float, Exception]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def resolve(self) -> Callable:
         if self.function is not None:
@@ -28,22 +36,46 @@ class CommandHandler:
         if self.python_name is None:
             raise RuntimeError("cannot resolve command without python_name")
 
+        if self._failure is not None:
+            failed_at, e = self._failure
+            if time.monotonic() - failed_at < IMPORT_RETRY_DELAY:
+                raise RuntimeError(
+                    f"Failed to import command at {self.python_name!r}: {e}"
+                ) from e
         try:
             self.function = utils.import_python_name(self.python_name)
         except Exception as e:
+            self._failure = (time.monotonic(), e)
             raise RuntimeError(
                 f"Failed to import command at {self.python_name!r}: {e}"
             ) from e
 
+        self._failure = None
         return self.function
 
 
+@dataclass
+class CommandStats:
+    """Statistics about the first use of a command.  Times are in seconds."""
+
+    # time taken to import the command's `python_name`
+    import_time: Optional[float] = None
+    # time taken to activate the plugin, if the first use of this command did
+    activation_time: Optional[float] = None
+    # number of failed attempts to import the command's `python_name`
+    import_failures: int = 0
+
+
 class CommandRegistry:
     command_registered = Signal(str)
     command_unregistered = Signal(str)
 
     def __init__(self) -> None:
         self._commands: Dict[str, CommandHandler] = {}
+        # guards mutations of `_commands` (reads take no lock)
+        self._lock = threading.Lock()
+        # (kept when commands are unregistered)
+        self._stats: Dict[str, CommandStats] = {}
 
     def register(self, id: str, command: Union[Callable, str]) -> PDisposable:
         """Register a command under `id`.
@@ -73,9 +105,6 @@ class CommandRegistry:
             raise ValueError(
                 f"Invalid command id for {command}, must be non-empty string"
             )
-        if id in self._commands:
-            raise ValueError(f"Command {id} already exists")
-
         if isinstance(command, str):
             if not DOTTED_NAME_PATTERN.match(command):
                 raise ValueError(
@@ -90,16 +119,20 @@ class CommandRegistry:
         # TODO: validate arguments and type constraints
         # possibly wrap command in a type validator?
 
-        self._commands[id] = cmd
+        with self._lock:
+            if id in self._commands:
+                raise ValueError(f"Command {id} already exists")
+            self._commands[id] = cmd
         self.command_registered.emit(id)
 
         return partial(self.unregister, id)
 
     def unregister(self, id: str):
         """Unregister command with key `id`.  No-op if key doesn't exist."""
-        if id in self._commands:
-            del self._commands[id]
-            self.command_unregistered.emit(id)
+        with self._lock:
+            if self._commands.pop(id, None) is None:
+                return
+        self.command_unregistered.emit(id)
 
     def register_manifest(self, mf: PluginManifest) -> None:
         """Register all commands in a manifest"""
@@ -117,18 +150,53 @@ class CommandRegistry:
 
     def get(self, id: str) -> Callable:
         """Get callable object for command `id`."""
+        handler = self._commands.get(id)
+        if handler is not None and handler.function is not None:
+            return handler.function  # fast path: already resolved
+
         # FIXME: who should control activation?
-        if id not in self._commands:
+        if handler is None:
             from ._plugin_manager import PluginManager
 
             pm = PluginManager.instance()
 
-            if id in pm._contrib._commands:
-                _, plugin_key = pm._contrib._commands[id]
+            # (a single lookup: the command may be unregistered concurrently)
+            if (contrib := pm._contrib._commands.get(id)) is not None:
+                _, plugin_key = contrib
+                start = time.perf_counter()
                 pm.activate(plugin_key)
-            if id not in self._commands:  # sourcery skip
+                activation_time = time.perf_counter() - start
+                if id in self._commands:
+                    self._stats_for(id).activation_time = activation_time
+            if (handler := self._commands.get(id)) is None:  # sourcery skip
                 raise KeyError(f"command {id!r} not registered")
-        return self._commands[id].resolve()
+
+        if handler.function is None:
+            failure = handler._failure
+            start = time.perf_counter()
+            try:
+                handler.resolve()
+            except RuntimeError:
+                if handler._failure is not failure:  # (not a cached failure)
+                    self._stats_for(id).import_failures += 1
+                raise
+            if handler.python_name is not None:
+                self._stats_for(id).import_time = time.perf_counter() - start
+        return handler.resolve()
+
+    def stats(self) -> Dict[str, CommandStats]:
+        """Return statistics about the first use of each (used) command.
+
+        This includes the time taken to import the command, and to activate the
+        plugin providing it, which may be used to find the plugins that slow down
+        the first use of their commands.
+        """
+        return {id: replace(stats) for id, stats in self._stats.items()}
+
+    def _stats_for(self, id: str) -> CommandStats:
+        if (stats := self._stats.get(id)) is None:
+            stats = self._stats.setdefault(id, CommandStats())
+        return stats
 
     def execute(self, id: str, args=(), kwargs=None) -> Any:
         if kwargs is None:
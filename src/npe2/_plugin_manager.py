@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import contextlib
+import copy
+import itertools
 import os
+import re
+import threading
 import urllib
 import warnings
-from collections import Counter
-from fnmatch import fnmatch
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from fnmatch import fnmatchcase, translate
+from functools import partial
 from importlib import metadata
 from pathlib import Path
 from typing import (
@@ -20,14 +26,17 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Pattern,
     Sequence,
     Set,
     Tuple,
+    TypeVar,
     Union,
 )
 
 from psygnal import Signal, SignalGroup
 
+from . import _reader_stats
 from ._command_registry import CommandRegistry
 from .manifest import PluginManifest
 from .manifest._npe1_adapter import NPE1Adapter
@@ -44,6 +53,7 @@ if TYPE_CHECKING:
         ThemeContribution,
         WidgetContribution,
     )
+    from .manifest.schema import DiscoverResults
 
     IntStr = Union[int, str]
     AbstractSetIntStr = AbstractSet[IntStr]
@@ -54,142 +64,497 @@ if TYPE_CHECKING:
 
 __all__ = ["PluginContext", "PluginManager"]
 PluginName = str  # this is `PluginManifest.name`
+T = TypeVar("T")
+BucketT = TypeVar("BucketT", bound=Dict[PluginName, Any])
+_GLOB_CHARS = re.compile(r"[*?\[\]/\\]")  # (or path separators)
 
 
 class _ContributionsIndex:
+    _MAX_LAST_READERS = 128
+
     def __init__(self) -> None:
         self._indexed: Set[str] = set()
         self._commands: Dict[str, Tuple[CommandContribution, PluginName]] = {}
-        self._readers: List[Tuple[str, ReaderContribution]] = []
-        self._writers: List[Tuple[LayerType, int, int, WriterContribution]] = []
-
-        # DEPRECATED: only here for napari <= 0.4.15 compat.
+        self._readers = _ReaderIndex()
+        self._writers = _WriterIndex()
+        # LRU of (extension, stack, lazy) -> reader that last returned data
+        self._last_readers: OrderedDict[Tuple[str, bool, bool], ReaderContribution]
+        self._last_readers = OrderedDict()
+
+        # contributions that are listed (rather than matched), by plugin. Each
+        # Dict[PluginName, ...] is kept sorted by plugin registration order.
+        self._ranks: Dict[PluginName, int] = {}
+        self._rank_counter = itertools.count()
+        self._menus: Dict[str, Dict[PluginName, List[MenuItem]]] = {}
+        self._submenus: Dict[str, Dict[PluginName, SubmenuContribution]] = {}
+        self._themes: Dict[PluginName, List[ThemeContribution]] = {}
+        self._widgets: Dict[PluginName, List[WidgetContribution]] = {}
         self._samples: DefaultDict[str, List[SampleDataContribution]] = DefaultDict(
             list
         )
 
+        # keys owned by each plugin (so that removing a plugin is cheap)
+        self._owned_commands: Dict[PluginName, List[str]] = {}
+        self._owned_menus: Dict[PluginName, List[str]] = {}
+        self._owned_submenus: Dict[PluginName, List[str]] = {}
+
+    def reserve(self, key: PluginName) -> None:
+        """Reserve a position for plugin `key` (in registration order).
+
+        Contributions of plugin `key` will be listed at this position, no matter
+        when the plugin is indexed (e.g. after being enabled).
+        """
+        self._ranks.setdefault(key, next(self._rank_counter))
+
+    def forget(self, key: PluginName) -> None:
+        """Remove plugin `key` and its reserved position."""
+        self.remove_contributions(key)
+        self._ranks.pop(key, None)
+
     def reindex(self, manifest):
         self.remove_contributions(manifest.name)
         self.index_contributions(manifest)
 
     def index_contributions(self, manifest: PluginManifest):
-        ctrb = manifest.contributions
-        if not ctrb or manifest.name in self._indexed:
-            return  # pragma: no cover
+        self.index_many([manifest])
 
-        self._indexed.add(manifest.name)
-        for cmd in ctrb.commands or ():
-            self._commands[cmd.id] = cmd, manifest.name
-        for reader in ctrb.readers or ():
-            for pattern in reader.filename_patterns:
-                self._readers.append((pattern, reader))
-            if reader.accepts_directories:
-                self._readers.append(("", reader))
-        for writer in ctrb.writers or ():
-            for c in writer.layer_type_constraints():
-                self._writers.append((c.layer_type, *c.bounds, writer))
+    def index_many(self, manifests: Iterable[PluginManifest]) -> None:
+        """Index the contributions of `manifests`, in one pass.
 
-        # DEPRECATED: only here for napari <= 0.4.15 compat.
-        if ctrb.sample_data:
-            self._samples[manifest.name] = ctrb.sample_data
+        The contributions of all manifests are gathered first, then each container
+        of the index is updated once.
+        """
+        commands: Dict[str, Tuple[CommandContribution, PluginName]] = {}
+        readers: List[ReaderContribution] = []
+        writers: List[WriterContribution] = []
+        menus: DefaultDict[str, Dict[PluginName, List[MenuItem]]] = DefaultDict(dict)
+        submenus: DefaultDict[str, Dict[PluginName, SubmenuContribution]]
+        submenus = DefaultDict(dict)
+        themes: Dict[PluginName, List[ThemeContribution]] = {}
+        widgets: Dict[PluginName, List[WidgetContribution]] = {}
+        samples: Dict[PluginName, List[SampleDataContribution]] = {}
+        for manifest in manifests:
+            ctrb = manifest.contributions
+            if not ctrb or manifest.name in self._indexed:
+                continue  # pragma: no cover
+
+            key = manifest.name
+            self.reserve(key)
+            self._indexed.add(key)
+            commands.update((cmd.id, (cmd, key)) for cmd in ctrb.commands or ())
+            self._owned_commands[key] = [cmd.id for cmd in ctrb.commands or ()]
+            readers.extend(ctrb.readers or ())
+            writers.extend(ctrb.writers or ())
+            for menu_key, items in ctrb.menus.items():
+                menus[menu_key][key] = items
+            self._owned_menus[key] = list(ctrb.menus)
+            for subm in ctrb.submenus or ():
+                submenus[subm.id].setdefault(key, subm)  # the first one wins
+            self._owned_submenus[key] = [subm.id for subm in ctrb.submenus or ()]
+            if ctrb.themes:
+                themes[key] = ctrb.themes
+            if ctrb.widgets:
+                widgets[key] = ctrb.widgets
+            if ctrb.sample_data:
+                samples[key] = ctrb.sample_data
+
+        # (commands first, as other threads may execute the readers and writers)
+        self._commands.update(commands)
+        if readers:
+            self._readers.add(readers)
+            self._last_readers = OrderedDict()
+        if writers:
+            self._writers.add(writers)
+        for menu_key, bucket in menus.items():
+            self._menus[menu_key] = self._add(self._menus.get(menu_key, {}), bucket)
+        for subm_id, subms in submenus.items():
+            self._submenus[subm_id] = self._add(self._submenus.get(subm_id, {}), subms)
+        if themes:
+            self._themes = self._add(self._themes, themes)
+        if widgets:
+            self._widgets = self._add(self._widgets, widgets)
+        if samples:
+            self._samples = self._add(self._samples, samples)
+
+    def _add(self, bucket: BucketT, new: Dict[PluginName, Any]) -> BucketT:
+        """Add `new` items to `bucket`, keeping it in plugin registration order.
+
+        `bucket` is updated in place if all of `new` goes last (by far the most
+        common case).  Otherwise, a sorted copy is returned: buckets are never
+        reordered in place, as other threads may be taking snapshots of them.
+        """
+        ranks = self._ranks
+        if len(new) > 1:  # (usually already sorted)
+            new = dict(sorted(new.items(), key=lambda kv: ranks[kv[0]]))
+        last = next(reversed(bucket.keys()), None)
+        if last is None or ranks[last] < ranks[next(iter(new))]:
+            bucket.update(new)
+            return bucket
+        items = sorted([*bucket.items(), *new.items()], key=lambda kv: ranks[kv[0]])
+        copied = copy.copy(bucket)  # (of the same type, e.g. DefaultDict)
+        copied.clear()
+        copied.update(items)
+        return copied
 
     def remove_contributions(self, key: PluginName) -> None:
         """This must completely remove everything added by `index_contributions`."""
         if key not in self._indexed:
             return  # pragma: no cover
 
-        for cmd_id, (_, plugin) in list(self._commands.items()):
-            if key == plugin:
+        for cmd_id in self._owned_commands.pop(key, ()):
+            if self._commands.get(cmd_id, (None, None))[1] == key:
                 del self._commands[cmd_id]
 
-        self._readers = [
-            (pattern, reader)
-            for pattern, reader in self._readers
-            if reader.plugin_name != key
-        ]
-
-        self._writers = [
-            (layer_type, min_, max_, writer)
-            for layer_type, min_, max_, writer in self._writers
-            if writer.plugin_name != key
-        ]
+        self._readers.remove_plugin(key)
+        self._last_readers = OrderedDict()
 
-        self._indexed.remove(key)
+        self._writers.remove_plugin(key)
 
-        # DEPRECATED: only here for napari <= 0.4.15 compat.
+        _remove_plugin_from(self._menus, self._owned_menus.pop(key, ()), key)
+        _remove_plugin_from(self._submenus, self._owned_submenus.pop(key, ()), key)
+        self._themes.pop(key, None)
+        self._widgets.pop(key, None)
         self._samples.pop(key, None)
 
+        self._indexed.remove(key)
+
     def get_command(self, command_id: str) -> CommandContribution:
         return self._commands[command_id][0]
 
-    def iter_compatible_readers(self, paths: List[str]) -> Iterator[ReaderContribution]:
-        assert isinstance(paths, list)
-        if not paths:
-            return  # pragma: no cover
+    # (listed contributions are read from a snapshot of their bucket, taken with a
+    # single `list(bucket.items())`, as buckets are updated in place)
 
-        if len({Path(i).suffix for i in paths}) > 1:
-            raise ValueError(
-                "All paths in the stack list must have the same extension."
-            )
-        path = paths[0]
-        if not path:
-            return
-        assert isinstance(path, str)
+    # Listed contributions.  `pending` manifests are registered, but not indexed
+    # (i.e. npe1 adapters): their contributions are listed in registration order,
+    # along with the indexed ones, without indexing them.
+
+    def get_submenu(
+        self, submenu_id: str, pending: Sequence[PluginManifest] = ()
+    ) -> SubmenuContribution:
+        extra: Dict[PluginName, SubmenuContribution] = {}
+        for mf in pending:
+            for subm in mf.contributions.submenus or ():
+                if subm.id == submenu_id:
+                    extra.setdefault(mf.name, subm)  # the first one wins
+        for _, subm in self._listed(self._submenus.get(submenu_id, {}), extra):
+            return subm
+        raise KeyError(f"No plugin provides a submenu with id {submenu_id}")
 
-        if os.path.isdir(path):
-            yield from (r for pattern, r in self._readers if pattern == "")
+    def iter_menu(
+        self, menu_key: str, pending: Sequence[PluginManifest] = ()
+    ) -> Iterator[MenuItem]:
+        extra = {
+            mf.name: items
+            for mf in pending
+            if (items := mf.contributions.menus.get(menu_key))
+        }
+        for _, items in self._listed(self._menus.get(menu_key, {}), extra):
+            yield from items
+
+    def menus(
+        self, pending: Sequence[PluginManifest] = ()
+    ) -> Dict[str, List[MenuItem]]:
+        if not pending:
+            menus: Dict[str, List[MenuItem]] = {}
+            for key, bucket in list(self._menus.items()):
+                if values := list(bucket.values()):
+                    menus[key] = list(itertools.chain.from_iterable(values))
+            return menus
+        keys = dict.fromkeys(self._menus)
+        for mf in pending:
+            keys.update(dict.fromkeys(mf.contributions.menus))
+        return {key: list(self.iter_menu(key, pending)) for key in keys}
+
+    def iter_themes(
+        self, pending: Sequence[PluginManifest] = ()
+    ) -> Iterator[ThemeContribution]:
+        extra = {mf.name: t for mf in pending if (t := mf.contributions.themes)}
+        for _, themes in self._listed(self._themes, extra):
+            yield from themes
+
+    def iter_widgets(
+        self, pending: Sequence[PluginManifest] = ()
+    ) -> Iterator[WidgetContribution]:
+        extra = {mf.name: w for mf in pending if (w := mf.contributions.widgets)}
+        for _, widgets in self._listed(self._widgets, extra):
+            yield from widgets
+
+    def iter_sample_data(
+        self, pending: Sequence[PluginManifest] = ()
+    ) -> Iterator[Tuple[PluginName, List[SampleDataContribution]]]:
+        extra = {mf.name: s for mf in pending if (s := mf.contributions.sample_data)}
+        yield from self._listed(self._samples, extra)
+
+    def _listed(
+        self, bucket: Dict[PluginName, T], extra: Dict[PluginName, T]
+    ) -> List[Tuple[PluginName, T]]:
+        """Return the items of `bucket` and `extra`, in plugin registration order."""
+        if not extra:
+            return list(bucket.items())  # (a snapshot)
+        ranks = self._ranks
+        return sorted({**bucket, **extra}.items(), key=lambda kv: ranks[kv[0]])
+
+    def iter_compatible_readers(self, paths: List[str]) -> Iterator[ReaderContribution]:
+        if (target := _reader_target(paths)) is None:
+            return
+        is_dir, path = target
+        if is_dir:
+            yield from self._readers.directory_readers()
         else:
-            # ensure not a URI
-            if not urllib.parse.urlparse(path).scheme:
-                # lower case the extension for checking manifest pattern
-                base = os.path.splitext(Path(path).stem)[0]
-                ext = "".join(Path(path).suffixes)
-                path = base + ext.lower()
-            # not sure about the set logic as it won't be lazy anymore,
-            # but would we yield duplicate anymore.
-            # above does not have have the unseen check either.
-            # it's easy to make an iterable version if we wish, or use more-itertools.
-            # match against pattern.lower() to make matching case insensitive
-            yield from {
-                r for pattern, r in self._readers if fnmatch(path, pattern.lower())
-            }
+            yield from self._readers.match(path)
+
+    def last_reader(
+        self, paths: List[str], stack: bool, lazy: bool = False
+    ) -> Optional[ReaderContribution]:
+        """Return the reader that last read paths like `paths`, if compatible."""
+        if not self._last_readers or (target := _reader_target(paths)) is None:
+            return None
+        key = (_reader_stats.key_for(paths), stack, lazy)
+        if (reader := self._last_readers.get(key)) is None:
+            return None
+        with contextlib.suppress(KeyError):  # (concurrently evicted)
+            self._last_readers.move_to_end(key)
+        is_dir, path = target
+        return reader if self._readers.accepts(reader, path, is_dir) else None
+
+    def set_last_reader(
+        self,
+        paths: List[str],
+        stack: bool,
+        reader: ReaderContribution,
+        lazy: bool = False,
+    ) -> None:
+        """Remember that `reader` read `paths` (see `last_reader`)."""
+        key = (_reader_stats.key_for(paths), stack, lazy)
+        self._last_readers[key] = reader
+        self._last_readers.move_to_end(key)
+        while len(self._last_readers) > self._MAX_LAST_READERS:
+            with contextlib.suppress(KeyError):
+                self._last_readers.popitem(last=False)
 
     def iter_compatible_writers(
         self, layer_types: Sequence[str]
     ) -> Iterator[WriterContribution]:
         """Attempt to match writers that consume all layers."""
+        if layer_types:
+            yield from self._writers.compatible(layer_types)
 
-        if not layer_types:
-            return
 
-        # First count how many of each distinct type are requested. We'll use
-        # this to get candidate writers compatible with the requested count.
-        counts = Counter(layer_types)
+class _ReaderIndex:
+    """Index of reader `filename_patterns`, for fast matching of paths.
 
-        def _get_candidates(lt: LayerType) -> Set[WriterContribution]:
-            return {
-                w
-                for layer, min_, max_, w in self._writers
-                if layer == lt and (min_ <= counts[lt] < max_)
-            }
+    Matching a path against every registered `(pattern, reader)` pair with
+    `fnmatch` is linear in the number of plugins.  Instead, patterns are split
+    (once, at index time) into:
 
-        # keep ordered without duplicates
-        candidates = list({w: None for _, _, _, w in self._writers})
-        for lt in LayerType:
-            if candidates:
-                candidates = [i for i in candidates if i in _get_candidates(lt)]
+    - simple extension patterns like `*.tif` or `*.ome.tif` (by far the most
+      common), stored in a hash map keyed on the lower-cased extension.  A path
+      matches these iff the path ends with the extension, so a path is looked
+      up using each of its (few) possible extensions.
+    - all other glob patterns, which are pre-compiled, with one combined regex
+      used to quickly reject paths that match none of them.
+
+    Entries are numbered in registration order, so that matches are always
+    returned in a deterministic order.  Patterns are matched case-insensitively.
+    """
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+        self._dirs: Dict[int, ReaderContribution] = {}
+        self._exts: DefaultDict[str, Dict[int, ReaderContribution]] = DefaultDict(dict)
+        self._globs: Dict[int, Tuple[Pattern[str], ReaderContribution]] = {}
+        # incremented *after* each change of `_globs`
+        self._globs_version = 0
+        # combined regex of all globs (lazily (re)built, for `_globs_version`)
+        self._any_glob: Tuple[int, Optional[Pattern[str]]] = (-1, None)
+        # entries added by each plugin: (n, extension or None)
+        self._owned: DefaultDict[PluginName, List[Tuple[int, Optional[str]]]]
+        self._owned = DefaultDict(list)
+
+    def add(self, readers: Iterable[ReaderContribution]) -> None:
+        # (dicts are updated in place, once for all `readers`: `match` only reads
+        # them with single, atomic operations, like `dict.update` or `list(d)`)
+        exts: DefaultDict[str, Dict[int, ReaderContribution]] = DefaultDict(dict)
+        globs: Dict[int, Tuple[Pattern[str], ReaderContribution]] = {}
+        dirs: Dict[int, ReaderContribution] = {}
+        for reader in readers:
+            owned = self._owned[reader.plugin_name]
+            for pattern in reader.filename_patterns:
+                n = next(self._counter)
+                pattern = os.path.normcase(pattern.lower())
+                ext = pattern[1:]
+                if pattern.startswith("*.") and not _GLOB_CHARS.search(ext):
+                    exts[ext][n] = reader
+                    owned.append((n, ext))
+                else:
+                    globs[n] = (re.compile(translate(pattern)), reader)
+                    owned.append((n, None))
+            if reader.accepts_directories:
+                n = next(self._counter)
+                dirs[n] = reader
+                owned.append((n, None))
+
+        for ext, bucket in exts.items():
+            self._exts[ext].update(bucket)
+        if globs:
+            self._globs.update(globs)
+            self._globs_version += 1
+        self._dirs.update(dirs)
+
+    def remove_plugin(self, plugin_name: PluginName) -> None:
+        for n, ext in self._owned.pop(plugin_name, ()):
+            if ext is None:
+                self._dirs.pop(n, None)
+                if self._globs.pop(n, None) is not None:
+                    self._globs_version += 1
             else:
-                break
+                bucket = self._exts[ext]
+                bucket.pop(n, None)
+                if not bucket:
+                    del self._exts[ext]
+
+    def accepts(self, reader: ReaderContribution, path: str, is_dir: bool) -> bool:
+        """Return True if `reader` is indexed, and would be matched for `path`."""
+        if reader.plugin_name not in self._owned:
+            return False
+        if is_dir:
+            return reader.accepts_directories
+        name = os.path.normcase(path)
+        return any(
+            fnmatchcase(name, os.path.normcase(pattern.lower()))
+            for pattern in reader.filename_patterns
+        )
 
-        def _writer_key(writer: WriterContribution) -> Tuple[bool, int]:
-            # 1. writers with no file extensions (like directory writers) go last
-            no_ext = len(writer.filename_extensions) == 0
+    def directory_readers(self) -> List[ReaderContribution]:
+        return list(self._dirs.values())
+
+    def match(self, path: str) -> List[ReaderContribution]:
+        """Return (unique) readers with a pattern matching `path`."""
+        name = os.path.normcase(path)
+        matches: Dict[int, ReaderContribution] = {}
+        if self._exts:
+            # every possible "extension" of name: each suffix starting with a "."
+            idx = name.find(".")
+            while idx != -1:
+                if bucket := self._exts.get(name[idx:]):
+                    matches.update(bucket)
+                idx = name.find(".", idx + 1)
+        if self._globs:
+            version = self._globs_version  # (read before `_globs`: see `add`)
+            globs = list(self._globs.items())  # (a snapshot)
+            built_for, any_glob = self._any_glob
+            if built_for != version or any_glob is None:
+                any_glob = re.compile(
+                    "|".join(f"(?:{rx.pattern})" for _, (rx, _) in globs)
+                )
+                self._any_glob = (version, any_glob)
+            if any_glob.match(name):
+                matches.update((k, r) for k, (rx, r) in globs if rx.match(name))
+        # registration order, without duplicates
+        return list(dict.fromkeys(matches[k] for k in sorted(matches)))
+
+
+def _reader_target(paths: List[str]) -> Optional[Tuple[bool, str]]:
+    """Return (is_dir, normalized path) used to match readers for `paths`."""
+    assert isinstance(paths, list)
+    if not paths:
+        return None  # pragma: no cover
+
+    if len({Path(i).suffix for i in paths}) > 1:
+        raise ValueError("All paths in the stack list must have the same extension.")
+    path = paths[0]
+    if not path:
+        return None
+    assert isinstance(path, str)
+
+    if os.path.isdir(path):
+        return True, path
+    # ensure not a URI
+    if not urllib.parse.urlparse(path).scheme:
+        # lower case the extension for checking manifest pattern
+        base = os.path.splitext(Path(path).stem)[0]
+        ext = "".join(Path(path).suffixes)
+        path = base + ext.lower()
+    return False, path
+
+
+def _remove_plugin_from(
+    index: Dict[str, Dict[PluginName, Any]], ids: Iterable[str], key: PluginName
+) -> None:
+    """Remove plugin `key` from the buckets `ids` of `index`."""
+    for id_ in ids:
+        bucket = index.get(id_, {})
+        if bucket.pop(key, None) is not None and not bucket:
+            del index[id_]
+
+
+class _WriterIndex:
+    """Index of writer `layer_types` constraints, for fast matching of layers.
+
+    Each writer's `layer_types` are parsed (once, at index time) into a tuple of
+    `(min, max)` bounds, with one entry for each `LayerType` (in a fixed order).
+    The requested layer types are counted into a vector in the same order, so
+    that checking a writer is a simple comparison of integers.  Since the same
+    combinations of layer types are requested over and over, the (sorted) list
+    of compatible writers is memoized for each combination of counts, and the
+    memo is cleared whenever writers are added or removed.
+    """
 
-            # 2. more "specific" writers first
-            nbounds = sum(not c.is_zero() for c in writer.layer_type_constraints())
-            return (no_ext, nbounds)
+    _MAX_MEMO = 256
 
-        yield from sorted(candidates, key=_writer_key)
+    def __init__(self) -> None:
+        self._layer_types = tuple(LayerType)
+        self._counter = itertools.count()
+        # bounds for each LayerType, sort key, writer (in registration order)
+        self._entries: Dict[
+            int,
+            Tuple[Tuple[Tuple[int, int], ...], Tuple[bool, int], WriterContribution],
+        ] = {}
+        self._owned: DefaultDict[PluginName, List[int]] = DefaultDict(list)
+        self._memo: Dict[Tuple[int, ...], List[WriterContribution]] = {}
+
+    def add(self, writers: Iterable[WriterContribution]) -> None:
+        entries = {}
+        for writer in writers:
+            bounds = dict.fromkeys(self._layer_types, (0, 1))
+            for c in writer.layer_type_constraints():
+                bounds[c.layer_type] = c.bounds
+            # 1. writers with no file extensions (like directory writers) go last
+            # 2. more "specific" writers first
+            no_ext = len(writer.filename_extensions) == 0
+            nbounds = sum(b != (0, 1) for b in bounds.values())
+            n = next(self._counter)
+            entries[n] = (tuple(bounds.values()), (no_ext, nbounds), writer)
+            self._owned[writer.plugin_name].append(n)
+        # (`compatible` may run concurrently: it reads a snapshot of `_entries`,
+        # which must be updated before `_memo` is replaced)
+        self._entries.update(entries)
+        self._memo = {}
+
+    def remove_plugin(self, plugin_name: PluginName) -> None:
+        if ns := self._owned.pop(plugin_name, ()):
+            for n in ns:
+                self._entries.pop(n, None)
+            self._memo = {}
+
+    def compatible(self, layer_types: Sequence[str]) -> List[WriterContribution]:
+        """Return (unique) writers compatible with `layer_types`, best first."""
+        counts = Counter(layer_types)
+        key = tuple(counts[lt] for lt in self._layer_types)
+        memo = self._memo  # (read before `_entries`: see `add`)
+        if (cached := memo.get(key)) is None:
+            matches = [
+                (sort_key, writer)
+                for bounds, sort_key, writer in list(self._entries.values())
+                if all(lo <= n < hi for (lo, hi), n in zip(bounds, key))
+            ]
+            # stable sort: keeps registration order for equal keys
+            matches.sort(key=lambda m: m[0])
+            cached = list(dict.fromkeys(w for _, w in matches))
+            if len(memo) >= self._MAX_MEMO:
+                memo.clear()
+            memo[key] = cached
+        return list(cached)
 
 
 class PluginManagerEvents(SignalGroup):
@@ -218,6 +583,35 @@ class PluginManagerEvents(SignalGroup):
 
 
 class PluginManager:
+    """Registry of plugin manifests, their contributions, and their activation.
+
+    Thread safety
+    -------------
+    The plugin manager may be used from multiple threads:
+
+    - Registration, unregistration, enablement and discovery are serialized by a
+      single (reentrant) lock, and are the only writers of the registered
+      manifests and of the contributions index.
+    - Reads (`iter_manifests`, `get_command`, `iter_compatible_*`, `iter_menu`,
+      ...) take no locks.  The containers they iterate or look up (the manifests,
+      commands, menus, themes, ...) are updated in place, one plugin (or one
+      batch of plugins) at a time, so that registering a plugin costs the same no
+      matter how many are registered.  Readers only look up single keys, or take a
+      snapshot of a container with a single atomic operation (like
+      `list(d.items())`) before iterating it, so they never see a container
+      changing while they iterate it.  Containers that are kept in registration
+      order are replaced (rather than reordered in place) when a plugin must be
+      listed before others.  The cache of the last successful reader for each kind
+      of path is shared by reading threads, and tolerates concurrent updates and
+      evictions.
+    - Activation and deactivation are serialized per plugin: `on_activate` is
+      called once, even if several threads activate the same plugin (e.g. by
+      executing its commands), while different plugins may activate concurrently.
+    - The `CommandRegistry` guards its own mutations with a lock.
+
+    Events are emitted in the thread that caused them, outside of any lock.
+    """
+
     __instance: Optional[PluginManager] = None  # a global instance
     _contrib: _ContributionsIndex
     events: PluginManagerEvents
@@ -232,6 +626,9 @@ class PluginManager:
         self._manifests: Dict[PluginName, PluginManifest] = {}
         self.events = PluginManagerEvents(self)
         self._npe1_adapters: List[NPE1Adapter] = []
+        # held while registering/indexing (see "Thread safety" above)
+        self._lock = threading.RLock()
+        self._activation_locks: Dict[PluginName, threading.RLock] = {}
 
         # up to napari 0.4.15, discovery happened in the init here
         # so if we're running on an older version of napari, we need to discover
@@ -263,7 +660,11 @@ class PluginManager:
     # Discovery, activation, enablement
 
     def discover(
-        self, paths: Sequence[str] = (), clear=False, include_npe1=False
+        self,
+        paths: Sequence[str] = (),
+        clear=False,
+        include_npe1=False,
+        workers: Optional[int] = None,
     ) -> int:
         """Discover and index plugin manifests in the environment.
 
@@ -279,6 +680,10 @@ class PluginManager:
         include_npe1 : bool
             Whether to detect npe1 plugins as npe1_adapters during discovery.
             By default `False`.
+        workers : int, optional
+            If greater than 1, plugin manifests are parsed and validated in a thread
+            pool of this size.  Registration (and the `plugins_registered` event)
+            still happens in discovery order.  By default, parsing is serial.
 
         Returns
         -------
@@ -286,29 +691,109 @@ class PluginManager:
             Number of discovered plugins
 
         """
+        with self.events.plugins_registered.paused(lambda a, b: (a[0] | b[0],)):
+            return self._discover(paths, clear, include_npe1, workers)
+
+    def discover_async(
+        self,
+        paths: Sequence[str] = (),
+        clear=False,
+        include_npe1=False,
+        workers: Optional[int] = None,
+        callback: Optional[Callable[[DiscoverResults], Any]] = None,
+    ) -> Future[int]:
+        """Discover and index plugin manifests in a background thread.
+
+        Plugins are registered progressively, as they are discovered, so that the
+        plugin manager may be used (e.g. to find readers for a file) while discovery
+        is running.  Parameters are the same as for `discover`, with:
+
+        Parameters
+        ----------
+        callback : Callable[[DiscoverResults], Any], optional
+            Called with each `DiscoverResults` as soon as it is resolved (and, if
+            applicable, registered).
+
+        Returns
+        -------
+        Future[int]
+            A future that resolves to the number of discovered plugins once discovery
+            is complete (or to the exception that interrupted it).
+
+        Notes
+        -----
+        `callback`, and all `plugins_registered` events, are called in the
+        background thread (one event per plugin).
+        """
+        future: Future[int] = Future()
+
+        def _run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    count = self._discover(
+                        paths, clear, include_npe1, workers, callback
+                    )
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(count)
+
+        threading.Thread(target=_run, name="npe2-discover", daemon=True).start()
+        return future
+
+    def _discover(
+        self,
+        paths: Sequence[str],
+        clear: bool,
+        include_npe1: bool,
+        workers: Optional[int],
+        callback: Optional[Callable[[DiscoverResults], Any]] = None,
+    ) -> int:
         if clear:
-            self._contrib = _ContributionsIndex()
-            self._manifests.clear()
+            with self._lock:
+                self._contrib = _ContributionsIndex()
+                self._manifests = {}
 
         count = 0
-
-        with self.events.plugins_registered.paused(lambda a, b: (a[0] | b[0],)):
-            for result in PluginManifest.discover(paths=paths):
-                if (
-                    result.manifest
-                    and result.manifest.name not in self._manifests
-                    and (include_npe1 or not isinstance(result.manifest, NPE1Adapter))
-                ):
+        for result in PluginManifest.discover(paths=paths, workers=workers):
+            if (
+                result.manifest
+                and result.manifest.name not in self._manifests
+                and (include_npe1 or not isinstance(result.manifest, NPE1Adapter))
+            ):
+                # (not under the lock: `register` emits `plugins_registered`)
+                with contextlib.suppress(ValueError):  # registered concurrently
                     self.register(result.manifest, warn_disabled=False)
                     count += 1
+            if callback is not None:
+                callback(result)
         return count
 
     def index_npe1_adapters(self):
         """Import and index any/all npe1 adapters."""
-        with warnings.catch_warnings():
+        with warnings.catch_warnings(), self._lock:
             warnings.showwarning = lambda e, *_: print(str(e).split(" Please add")[0])
             while self._npe1_adapters:
-                self._contrib.index_contributions(self._npe1_adapters.pop())
+                adapter = self._npe1_adapters.pop()
+                # (skip adapters that were unregistered or disabled in the meantime)
+                if self._manifests.get(adapter.name) is adapter and not (
+                    self.is_disabled(adapter.name)
+                ):
+                    self._contrib.index_contributions(adapter)
+
+    def _pending_npe1_adapters(self) -> List[NPE1Adapter]:
+        """Return npe1 adapters that are registered and enabled, but not indexed.
+
+        npe1 adapters are only indexed by `index_npe1_adapters` (which imports the
+        npe1 plugins), but they are listed alongside all other enabled plugins.
+        """
+        manifests = self._manifests
+        return [
+            adapter
+            for adapter in list(self._npe1_adapters)
+            if manifests.get(adapter.name) is adapter
+            and not self.is_disabled(adapter.name)
+        ]
 
     def register(
         self, manifest_or_package: Union[PluginManifest, str], warn_disabled=True
@@ -329,41 +814,122 @@ class PluginManager:
         ValueError
             If a plugin with the same name is already registered.
         """
+        manifest = self._resolve_manifest(manifest_or_package)
+        with self._lock:
+            if manifest.name in self._manifests:
+                msg = f"A manifest with name {manifest.name!r} already exists."
+                raise ValueError(msg)
+            self._manifests[manifest.name] = manifest
+            self._index_manifests([manifest], warn_disabled)
+        self.events.plugins_registered.emit({manifest})
+
+    def register_many(
+        self,
+        manifests: Iterable[Union[PluginManifest, str]],
+        warn_disabled=True,
+    ) -> None:
+        """Register many plugin manifests (or paths, or package names) at once.
+
+        This is equivalent to calling `register` for each item, except that all
+        names are checked for conflicts before anything is registered, and
+        `plugins_registered` is emitted only once, with all the new manifests.
+
+        Parameters
+        ----------
+        manifests : Iterable[Union[PluginManifest, str]]
+            PluginManifest instances and/or strings, as accepted by `register`.
+        warn_disabled : bool, optional
+            If True, emits a warning for each plugin being registered that is marked
+            as disabled, by default True.
+
+        Raises
+        ------
+        ValueError
+            If any plugin is already registered, or if two items have the same name.
+            In that case, none of the plugins are registered.
+        """
+        resolved = [self._resolve_manifest(m) for m in manifests]
+        counts = Counter(mf.name for mf in resolved)
+        with self._lock:
+            if conflicts := sorted(
+                name for name, n in counts.items() if n > 1 or name in self._manifests
+            ):
+                raise ValueError(f"Manifests with names {conflicts!r} already exist.")
+            self._manifests.update({mf.name: mf for mf in resolved})
+            self._index_manifests(resolved, warn_disabled)
+        if resolved:
+            self.events.plugins_registered.emit(set(resolved))
+
+    def _resolve_manifest(
+        self, manifest_or_package: Union[PluginManifest, str]
+    ) -> PluginManifest:
         if isinstance(manifest_or_package, str):
             if Path(manifest_or_package).is_file():
-                manifest = PluginManifest.from_file(manifest_or_package)
-            else:
-                manifest = PluginManifest.from_distribution(manifest_or_package)
+                return PluginManifest.from_file(manifest_or_package)
+            return PluginManifest.from_distribution(manifest_or_package)
         elif isinstance(manifest_or_package, PluginManifest):
-            manifest = manifest_or_package
-        else:  # pragma: no cover
-            raise TypeError(
-                "The first argument to register must be a string or a PluginManifest."
-            )
-        if manifest.name in self._manifests:
-            raise ValueError(f"A manifest with name {manifest.name!r} already exists.")
-
-        self._manifests[manifest.name] = manifest
-        if self.is_disabled(manifest.name):
-            if warn_disabled:
-                warnings.warn(
-                    f"Disabled plugin {manifest.name!r} was registered, but will not "
-                    "be indexed. Use `warn_disabled=False` to suppress this message.",
-                    stacklevel=2,
-                )
-        elif isinstance(manifest, NPE1Adapter):
-            self._npe1_adapters.append(manifest)
-        else:
-            self._contrib.index_contributions(manifest)
-        self.events.plugins_registered.emit({manifest})
+            return manifest_or_package
+        raise TypeError(  # pragma: no cover
+            "The first argument to register must be a string or a PluginManifest."
+        )
+
+    def _index_manifests(
+        self, manifests: Sequence[PluginManifest], warn_disabled: bool
+    ) -> None:
+        """Index newly registered `manifests`, all at once (with the lock held)."""
+        to_index = []
+        for manifest in manifests:
+            self._contrib.reserve(manifest.name)
+            if self.is_disabled(manifest.name):
+                if warn_disabled:
+                    warnings.warn(
+                        f"Disabled plugin {manifest.name!r} was registered, but will "
+                        "not be indexed. Use `warn_disabled=False` to suppress this "
+                        "message.",
+                        stacklevel=3,  # the caller of `register[_many]`
+                    )
+            elif isinstance(manifest, NPE1Adapter):
+                self._npe1_adapters.append(manifest)
+            else:
+                to_index.append(manifest)
+        self._contrib.index_many(to_index)
 
     def unregister(self, key: PluginName):
         """Unregister plugin named `key`."""
-        if key not in self._manifests:
-            raise ValueError(f"No registered plugin named {key!r}")  # pragma: no cover
-        self.deactivate(key)
-        self._contrib.remove_contributions(key)
-        self._manifests.pop(key)
+        # (deactivation emits events: outside of the lock)
+        with contextlib.suppress(KeyError):
+            self.deactivate(key)
+        with self._lock:
+            if key not in self._manifests:  # pragma: no cover
+                raise ValueError(f"No registered plugin named {key!r}")
+            self._remove_manifest(key)
+
+    def unregister_many(self, keys: Iterable[PluginName]) -> None:
+        """Unregister all plugins named in `keys`.
+
+        Raises
+        ------
+        ValueError
+            If any of the plugins is not registered.  In that case, none of the
+            plugins are unregistered.
+        """
+        keys = list(dict.fromkeys(keys))
+        if missing := [key for key in keys if key not in self._manifests]:
+            raise ValueError(f"No registered plugins named {missing!r}")
+        # (deactivation emits events: outside of the lock)
+        for key in keys:
+            with contextlib.suppress(KeyError):
+                self.deactivate(key)
+        with self._lock:
+            if missing := [key for key in keys if key not in self._manifests]:
+                raise ValueError(f"No registered plugins named {missing!r}")
+            for key in keys:
+                self._remove_manifest(key)
+
+    def _remove_manifest(self, key: PluginName) -> None:
+        self._contrib.forget(key)
+        self._activation_locks.pop(key, None)
+        del self._manifests[key]
 
     def activate(self, key: PluginName) -> PluginContext:
         """Activate plugin with `key`.
@@ -377,36 +943,43 @@ class PluginManager:
             - emits an event
         """
         # TODO: this is an important function... should be carefully considered
-        if key not in self._manifests:
+        if (mf := self._manifests.get(key)) is None:
             raise KeyError(f"Cannot activate unrecognized plugin: {key!r}")
 
         if self.is_disabled(key):
             raise ValueError(f"Cannot activate disabled plugin: {key!r}")
 
-        # create the context that will be with this plugin for its lifetime.
-        ctx = self.get_context(key)
-        if ctx._activated:
-            # prevent "reactivation"
-            return ctx
-
-        mf = self._manifests[key]
-        try:
-            if mf.on_activate:
-                _call_python_name(mf.on_activate, args=(ctx,))
-        except Exception as e:  # pragma: no cover
-            self._contexts.pop(key, None)
-            raise type(e)(f"Activating plugin {key!r} failed: {e}") from e
-
-        self.commands.register_manifest(mf)
-        ctx._activated = True
+        with self._activation_lock(key):
+            # create the context that will be with this plugin for its lifetime.
+            ctx = self.get_context(key)
+            if ctx._activated:
+                # prevent "reactivation"
+                return ctx
+
+            try:
+                if mf.on_activate:
+                    _call_python_name(mf.on_activate, args=(ctx,))
+            except Exception as e:  # pragma: no cover
+                self._contexts.pop(key, None)
+                raise type(e)(f"Activating plugin {key!r} failed: {e}") from e
+
+            self.commands.register_manifest(mf)
+            ctx._activated = True
         self.events.activation_changed({mf.name}, {})
         return ctx
 
+    def _activation_lock(self, plugin_name: PluginName) -> threading.RLock:
+        # (reentrant, as on_activate may execute the plugin's own commands)
+        if (lock := self._activation_locks.get(plugin_name)) is None:
+            lock = self._activation_locks.setdefault(plugin_name, threading.RLock())
+        return lock
+
     def get_context(self, plugin_name: PluginName) -> PluginContext:
         """Return PluginContext for plugin_name"""
-        if plugin_name not in self._contexts:
-            self._contexts[plugin_name] = PluginContext(plugin_name, reg=self.commands)
-        return self._contexts[plugin_name]
+        if (ctx := self._contexts.get(plugin_name)) is None:
+            ctx = PluginContext(plugin_name, reg=self.commands)
+            ctx = self._contexts.setdefault(plugin_name, ctx)
+        return ctx
 
     def deactivate(self, plugin_name: PluginName) -> None:
         """Deactivate `plugin_name`
@@ -423,16 +996,91 @@ class PluginManager:
             - "disable" the plugin (i.e. it can still be used).
         """
         mf = self._manifests[plugin_name]
-        self.commands.unregister_manifest(mf)
-        if plugin_name not in self._contexts:
-            return
-        ctx = self._contexts.pop(plugin_name)
-        if mf.on_deactivate:
-            _call_python_name(mf.on_deactivate, args=(ctx,))
-        ctx._activated = False
-        ctx._dispose()
+        with self._activation_lock(plugin_name):
+            self.commands.unregister_manifest(mf)
+            if (ctx := self._contexts.pop(plugin_name, None)) is None:
+                return
+            if mf.on_deactivate:
+                _call_python_name(mf.on_deactivate, args=(ctx,))
+            ctx._activated = False
+            ctx._dispose()
         self.events.activation_changed({}, {mf.name})
 
+    def prefetch(
+        self,
+        commands: Optional[Iterable[str]] = None,
+        plugins: Optional[Iterable[PluginName]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Future[Dict[str, BaseException]]:
+        """Import the `python_name` of commands in background threads.
+
+        The first execution of a command imports its module, which may take a long
+        time.  This imports the commands' modules ahead of time (without activating
+        any plugin), so that later executions find them already imported.  Commands
+        of plugins that are already activated are fully resolved.
+
+        Parameters
+        ----------
+        commands : Iterable[str], optional
+            Ids of commands to prefetch.
+        plugins : Iterable[str], optional
+            Names of plugins whose commands should all be prefetched.  If neither
+            `commands` nor `plugins` is provided, the commands of all enabled plugins
+            are prefetched.
+        max_workers : int, optional
+            Maximum number of threads used to import modules.  By default, the
+            default of `concurrent.futures.ThreadPoolExecutor`.
+
+        Returns
+        -------
+        Future[Dict[str, BaseException]]
+            A future that resolves (once all imports are done) to a mapping of
+            command id to the exception raised while prefetching it.  Failures are
+            never raised.
+        """
+        from .manifest.utils import import_python_name
+
+        # (a snapshot: plugins may be indexed concurrently, e.g. by discover_async)
+        owned = dict(self._contrib._owned_commands)
+        ids: Dict[str, None] = {}  # (ordered set)
+        if commands is None and plugins is None:
+            plugins = list(owned)
+        ids.update(dict.fromkeys(commands or ()))
+        for plugin in plugins or ():
+            ids.update(dict.fromkeys(owned.get(plugin, ())))
+
+        def _prefetch(id: str) -> None:
+            if (handler := self.commands._commands.get(id)) is not None:
+                handler.resolve()
+            elif python_name := self.get_command(id).python_name:
+                import_python_name(python_name)
+
+        result: Future[Dict[str, BaseException]] = Future()
+        result.set_running_or_notify_cancel()
+        failures: Dict[str, BaseException] = {}
+        pending = len(ids)
+        pending_lock = threading.Lock()
+
+        def _done(id: str, future: Future) -> None:
+            nonlocal pending
+            if (exc := future.exception()) is not None:
+                failures[id] = exc
+            with pending_lock:
+                pending -= 1
+                if pending:
+                    return
+            result.set_result(failures)
+
+        if not ids:
+            result.set_result(failures)
+            return result
+
+        pool = ThreadPoolExecutor(max_workers, thread_name_prefix="npe2-prefetch")
+        for id in ids:
+            pool.submit(_prefetch, id).add_done_callback(partial(_done, id))
+        pool.shutdown(wait=False)
+        return result
+
     def enable(self, plugin_name: PluginName) -> None:
         """Enable a plugin (which mostly means just `un-disable` it).
 
@@ -441,10 +1089,11 @@ class PluginManager:
         if not self.is_disabled(plugin_name):
             return  # pragma: no cover
 
-        self._disabled_plugins.remove(plugin_name)
-        mf = self._manifests.get(plugin_name)
-        if mf is not None:
-            self._contrib.index_contributions(mf)
+        with self._lock:
+            self._disabled_plugins.remove(plugin_name)
+            mf = self._manifests.get(plugin_name)
+            if mf is not None:
+                self._contrib.index_contributions(mf)
         self.events.enablement_changed({plugin_name}, {})
 
     def disable(self, plugin_name: PluginName) -> None:
@@ -462,8 +1111,9 @@ class PluginManager:
         with contextlib.suppress(KeyError):
             self.deactivate(plugin_name)
 
-        self._disabled_plugins.add(plugin_name)
-        self._contrib.remove_contributions(plugin_name)
+        with self._lock:
+            self._disabled_plugins.add(plugin_name)
+            self._contrib.remove_contributions(plugin_name)
         self.events.enablement_changed({}, {plugin_name})
 
     def is_disabled(self, plugin_name: str) -> bool:
@@ -475,10 +1125,10 @@ class PluginManager:
     def get_manifest(self, plugin_name: str) -> PluginManifest:
         """Get manifest for `plugin_name`"""
         key = str(plugin_name).split(".")[0]
-        if key not in self._manifests:
+        if (mf := self._manifests.get(key)) is None:
             msg = f"Manifest key {key!r} not found in {list(self._manifests)}"
             raise KeyError(msg)
-        return self._manifests[key]
+        return mf
 
     def iter_manifests(
         self, disabled: Optional[bool] = None
@@ -495,7 +1145,8 @@ class PluginManager:
         ------
         PluginManifest
         """
-        for key, mf in self._manifests.items():
+        # (a snapshot: `_manifests` may be updated by other threads)
+        for key, mf in list(self._manifests.items()):
             if disabled is True and not self.is_disabled(key):
                 continue
             elif disabled is False and self.is_disabled(key):
@@ -560,7 +1211,7 @@ class PluginManager:
             out["disabled"] = set(self._disabled_plugins)
         if not exclude or "activated" not in exclude:
             out["activated"] = {
-                name for name, ctx in self._contexts.items() if ctx._activated
+                name for name, ctx in list(self._contexts.items()) if ctx._activated
             }
         return out
 
@@ -581,19 +1232,21 @@ class PluginManager:
 
     def get_submenu(self, submenu_id: str) -> SubmenuContribution:
         """Get SubmenuContribution for `submenu_id`."""
-        for mf in self.iter_manifests(disabled=False):
-            for subm in mf.contributions.submenus or ():
-                if submenu_id == subm.id:
-                    return subm
-        raise KeyError(f"No plugin provides a submenu with id {submenu_id}")
+        return self._contrib.get_submenu(submenu_id, self._pending_npe1_adapters())
 
     def iter_menu(self, menu_key: str, disabled=False) -> Iterator[MenuItem]:
         """Iterate over `MenuItems` in menu with id `menu_key`."""
+        if disabled is False:
+            pending = self._pending_npe1_adapters()
+            yield from self._contrib.iter_menu(menu_key, pending)
+            return
         for mf in self.iter_manifests(disabled=disabled):
             yield from mf.contributions.menus.get(menu_key, ())
 
     def menus(self, disabled=False) -> Dict[str, List[MenuItem]]:
         """Return all registered menu_key -> List[MenuItems]."""
+        if disabled is False:
+            return self._contrib.menus(self._pending_npe1_adapters())
         _menus: DefaultDict[str, List[MenuItem]] = DefaultDict(list)
         for mf in self.iter_manifests(disabled=disabled):
             for key, menus in mf.contributions.menus.items():
@@ -602,8 +1255,7 @@ class PluginManager:
 
     def iter_themes(self) -> Iterator[ThemeContribution]:
         """Iterate over discovered/enuabled `ThemeContributions`."""
-        for mf in self.iter_manifests(disabled=False):
-            yield from mf.contributions.themes or ()
+        yield from self._contrib.iter_themes(self._pending_npe1_adapters())
 
     def iter_compatible_readers(
         self, path: Union[PathLike, Sequence[str]]
@@ -634,16 +1286,13 @@ class PluginManager:
 
     def iter_widgets(self) -> Iterator[WidgetContribution]:
         """Iterate over discovered WidgetContributions."""
-        for mf in self.iter_manifests(disabled=False):
-            yield from mf.contributions.widgets or ()
+        yield from self._contrib.iter_widgets(self._pending_npe1_adapters())
 
     def iter_sample_data(
         self,
     ) -> Iterator[Tuple[PluginName, List[SampleDataContribution]]]:
         """Iterates over (plugin_name, [sample_contribs])."""
-        for mf in self.iter_manifests(disabled=False):
-            if mf.contributions.sample_data:
-                yield mf.name, mf.contributions.sample_data
+        yield from self._contrib.iter_sample_data(self._pending_npe1_adapters())
 
     def get_writer(
         self, path: str, layer_types: Sequence[str], plugin_name: Optional[str] = None
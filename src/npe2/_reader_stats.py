@@ -0,0 +1,129 @@
+"""Persistent history of which readers returned data for which file extensions.
+
+`io_utils._read` tries each compatible reader in turn, which imports each
+reader's module, until one of them returns data.  This module records, for each
+file extension, how often each reader succeeded (returned data) or failed
+(returned `None`), so that readers that have succeeded before can be tried
+first, and readers that repeatedly failed can be tried last.
+
+The history is kept in memory, and stored under the user cache directory when the
+order in which readers are tried changes (rarely: mostly on the first reads of
+each kind of file) and at exit.  It is not persisted if the `NPE2_NOCACHE`
+environment variable is set.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
+
+from appdirs import user_cache_dir
+
+from .manifest._bases import load_cache_file, save_cache_file
+
+if TYPE_CHECKING:
+    from .manifest.contributions import ReaderContribution
+
+READER_STATS = Path(user_cache_dir("napari", "napari")) / "npe2" / "reader_stats.json"
+DIRECTORY_KEY = "<directory>"
+# readers that failed at least this many times (and more often than they
+# succeeded) for an extension are tried last
+MIN_FAILURES = 2
+
+# {extension: {reader command id: [successes, failures]}}
+_Stats = Dict[str, Dict[str, List[int]]]
+_stats: Optional[_Stats] = None  # lazily loaded
+_dirty = False  # whether `_stats` has changes that were not saved yet
+_lock = threading.Lock()  # guards `_stats` and `_dirty`
+_save_lock = threading.Lock()  # orders saves (snapshot and write)
+
+
+def key_for(paths: Union[str, Sequence[str]]) -> str:
+    """Return the key under which reads of `paths` are recorded."""
+    path = str(paths if isinstance(paths, (str, Path)) else paths[0])
+    if os.path.isdir(path):
+        return DIRECTORY_KEY
+    # (up to) two suffixes, to tell apart formats like `.ome.tif` and `.tif`
+    return "".join(Path(path).suffixes[-2:]).lower()
+
+
+def sort_readers(
+    key: str, readers: Sequence[ReaderContribution]
+) -> List[ReaderContribution]:
+    """Return `readers` in the order they should be tried for extension `key`.
+
+    Readers that succeeded before come first, then readers without a clear history,
+    then readers that repeatedly failed.  Otherwise, the order is unchanged.
+    """
+    history = _get().get(key, {})
+    if not history:
+        return list(readers)
+
+    return sorted(readers, key=lambda r: _rank(*history.get(r.command, (0, 0))))
+
+
+def _rank(successes: int, failures: int) -> int:
+    if successes and successes >= failures:
+        return 0
+    return 2 if failures >= MIN_FAILURES and failures > successes else 1
+
+
+def record(key: str, reader: ReaderContribution, success: bool) -> None:
+    """Record whether `reader` returned data for extension `key`.
+
+    The history is saved only if this changes the rank of `reader` (see
+    `sort_readers`); other changes are saved at exit.
+    """
+    global _dirty
+    with _lock:
+        counts = _get().setdefault(key, {}).setdefault(reader.command, [0, 0])
+        rank = _rank(*counts)
+        counts[0 if success else 1] += 1
+        _dirty = True
+        rank_changed = _rank(*counts) != rank
+    if rank_changed:
+        save()
+
+
+@atexit.register
+def save() -> None:
+    """Save the history, if it has unsaved changes."""
+    global _dirty
+    with _save_lock:
+        with _lock:
+            if not _dirty:
+                return
+            text = json.dumps(_stats)
+            _dirty = False
+        _write(text)
+
+
+def clear() -> List[Path]:
+    """Forget all history, returning the list of paths removed."""
+    global _stats, _dirty
+    with _lock:
+        _stats = {}
+        _dirty = False
+        if READER_STATS.exists():
+            READER_STATS.unlink()
+            return [READER_STATS]
+    return []
+
+
+def _get() -> _Stats:
+    global _stats
+    if _stats is None:
+        _stats = _load()
+    return _stats
+
+
+def _load() -> _Stats:
+    stats = load_cache_file(READER_STATS, json.load)
+    return stats if isinstance(stats, dict) else {}
+
+
+def _write(text: str) -> None:
+    save_cache_file(READER_STATS, text.encode())
@@ -306,9 +306,9 @@ def list(
 
         _pprint_formatted(json.dumps(data, indent=1), Format.json)
     elif format in (ListFormat.yaml):
-        import yaml
+        from npe2.manifest._bases import yaml_dump
 
-        _pprint_formatted(yaml.safe_dump(data, sort_keys=False), Format.yaml)
+        _pprint_formatted(yaml_dump(data), Format.yaml)
     elif format in (ListFormat.compact):
         template = "  - {name}: {version} ({ncontrib} contributions)"
         for r in data:
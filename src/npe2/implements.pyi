@@ -15,6 +15,7 @@ def reader(
     title: str,
     filename_patterns: List[str],
     accepts_directories: bool = False,
+    lazy: bool = False,
     ensure_args_valid: bool = False,
 ) -> Callable[[T], T]:
     """Mark a function as a reader contribution"""
@@ -26,6 +27,7 @@ def writer(
     layer_types: List[str],
     filename_extensions: List[str] = [],  # noqa: B006
     display_name: str = "",
+    streaming: bool = False,
     ensure_args_valid: bool = False,
 ) -> Callable[[T], T]:
     """Mark function as a writer contribution"""
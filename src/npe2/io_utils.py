@@ -1,29 +1,48 @@
 from __future__ import annotations
 
+import os
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 from typing import (
     TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
     List,
     Literal,
     Optional,
     Sequence,
     Tuple,
+    TypeVar,
     Union,
     cast,
     overload,
 )
 
-from . import PluginManager
+from . import PluginManager, _reader_stats
 from .manifest.utils import v1_to_v2
-from .types import FullLayerData, LayerData
+from .types import ChunkedData, FullLayerData, LayerData, LayerDataTuple
 
 if TYPE_CHECKING:
     import napari.layers
 
     from .manifest.contributions import ReaderContribution, WriterContribution
 
+T = TypeVar("T")
+
 
 def read(
-    paths: List[str], *, stack: bool, plugin_name: Optional[str] = None
+    paths: List[str],
+    *,
+    stack: bool,
+    plugin_name: Optional[str] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
 ) -> List[LayerData]:
     """Try to read file at `path`, with plugins offering a ReaderContribution.
 
@@ -36,6 +55,15 @@ def read(
     plugin_name : str, optional
         Optional plugin name.  If provided, only readers from this plugin will be
         tried (it's possible that none will be compatible). by default None
+    lazy : bool
+        Prefer readers that return lazy data (see `ReaderContribution.lazy`), whose
+        arrays load their data on demand.  Other readers are still tried if no lazy
+        reader returns data.  By default False.
+    timeout : float, optional
+        Time budget of each reader, in seconds.  If provided, each reader is run in
+        a worker thread, and abandoned (though it can't be stopped) if it has not
+        returned data after `timeout` seconds: the next compatible reader is then
+        tried.  By default, readers are given unlimited time.
 
     Returns
     -------
@@ -49,7 +77,132 @@ def read(
         If no readers are found or none return data
     """
     assert isinstance(paths, list)
-    return _read(paths, plugin_name=plugin_name, stack=stack)
+    return _read(
+        paths, plugin_name=plugin_name, stack=stack, lazy=lazy, timeout=timeout
+    )
+
+
+def read_many(
+    paths: Iterable[Union[str, List[str]]],
+    *,
+    stack: bool = False,
+    plugin_name: Optional[str] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    _pm: Optional[PluginManager] = None,
+) -> Iterator[
+    Tuple[
+        Union[str, List[str]],
+        Union[List[LayerData], Exception],
+        Optional[ReaderContribution],
+    ]
+]:
+    """Read many paths in parallel, yielding the results in order.
+
+    Each item of `paths` is read as with `read`, in a pool of threads.  Items are
+    grouped by kind of path (their extension, and the readers compatible with
+    them): the order in which readers are tried is resolved once for each group
+    (with its first item), and once a reader returned data for the first item of a
+    group, it is tried first for the other items.  Failures do not interrupt the
+    other reads.
+
+    Parameters
+    ----------
+    paths : iterable of str or list of str
+        Paths to read.  Each item may be a single path, or a list of paths to be
+        read together (see `stack`).  The iterable is consumed lazily.
+    stack : bool
+        Should the readers stack the files of each item, by default False.
+    plugin_name : str, optional
+        Optional plugin name.  If provided, only readers from this plugin will be
+        tried.
+    lazy : bool
+        Prefer readers that return lazy data, by default False.  See `read`.
+    timeout : float, optional
+        Time budget of each reader, in seconds.  See `read`.
+    max_workers : int, optional
+        Maximum number of threads reading at the same time.  By default, the
+        default of `concurrent.futures.ThreadPoolExecutor`.
+
+    Yields
+    ------
+    Tuple[path, Union[List[LayerData], Exception], Optional[ReaderContribution]]
+        For each item of `paths`, in order: the item, and either the data read
+        and the reader that read it, or the exception raised and `None`.  At most
+        twice `max_workers` items are read ahead of the consumer, so memory use
+        stays bounded.
+    """
+    if _pm is None:
+        _pm = PluginManager.instance()
+    pm = _pm
+    n_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    groups: Dict[Tuple[str, Tuple[int, ...]], _ReaderGroup] = {}
+
+    def _read_one(_paths: List[str], group: _ReaderGroup, first: bool):
+        if not first:  # (the first item of the group was submitted before)
+            group.resolved.wait()
+        readers = group.readers
+        try:
+            data, reader = _read(
+                _paths,
+                stack=stack,
+                plugin_name=plugin_name,
+                lazy=lazy,
+                timeout=timeout,
+                return_reader=True,
+                _pm=pm,
+                _readers=readers,
+            )
+            if first and readers is not None:  # try this reader first from now on
+                group.readers = [reader, *(r for r in readers if r is not reader)]
+            return data, reader
+        finally:
+            if first:
+                group.resolved.set()
+
+    def _submit(pool: ThreadPoolExecutor, path: Union[str, List[str]]) -> Future:
+        _paths = [path] if isinstance(path, str) else list(path)
+        try:  # (the same readers, tried in the same order, for all of the group)
+            compatible = pm.iter_compatible_readers(_paths)
+            key = (_reader_stats.key_for(_paths), tuple(map(id, compatible)))
+        except Exception:  # (e.g. mixed extensions) let `_read` raise the error
+            key = None
+        if first := key is None or key not in groups:
+            group = _ReaderGroup()
+            try:
+                group.readers = list(
+                    _iter_readers(pm, _paths, stack, plugin_name, lazy)
+                )
+            except Exception:  # let `_read` raise the error
+                pass
+            if key is not None:
+                groups[key] = group
+        else:
+            group = groups[key]
+        return pool.submit(_read_one, _paths, group, first)
+
+    window: Deque[Tuple[Union[str, List[str]], Future]] = deque()
+
+    def _pop():
+        path, future = window.popleft()
+        try:
+            data, reader = future.result()
+        except Exception as e:
+            return path, e, None
+        return path, data, reader
+
+    with ThreadPoolExecutor(n_workers, thread_name_prefix="npe2-read") as pool:
+        try:
+            for path in paths:
+                window.append((path, _submit(pool, path)))
+                if len(window) >= 2 * n_workers:
+                    yield _pop()
+            while window:
+                yield _pop()
+        finally:  # (e.g. the generator was closed early)
+            for _, future in window:
+                future.cancel()
 
 
 def read_get_reader(
@@ -57,6 +210,8 @@ def read_get_reader(
     *,
     plugin_name: Optional[str] = None,
     stack: Optional[bool] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
 ) -> Tuple[List[LayerData], ReaderContribution]:
     """Variant of `read` that also returns the `ReaderContribution` used."""
     if stack is None:
@@ -64,13 +219,25 @@ def read_get_reader(
         # Napari 0.4.15 and older, hopefully we can drop this and make stack mandatory
         new_path, new_stack = v1_to_v2(path)
         return _read(
-            new_path, plugin_name=plugin_name, return_reader=True, stack=new_stack
+            new_path,
+            plugin_name=plugin_name,
+            return_reader=True,
+            stack=new_stack,
+            lazy=lazy,
+            timeout=timeout,
         )
     else:
         assert isinstance(path, list)
         for p in path:
             assert isinstance(p, str)
-        return _read(path, plugin_name=plugin_name, return_reader=True, stack=stack)
+        return _read(
+            path,
+            plugin_name=plugin_name,
+            return_reader=True,
+            stack=stack,
+            lazy=lazy,
+            timeout=timeout,
+        )
 
 
 def write(
@@ -115,6 +282,61 @@ def write_get_writer(
     return _write(path, layer_data, plugin_name=plugin_name, return_writer=True)
 
 
+def convert(
+    src: Union[str, List[str]],
+    dst: str,
+    *,
+    stack: bool = False,
+    lazy: bool = False,
+    reader_plugin: Optional[str] = None,
+    writer_plugin: Optional[str] = None,
+) -> List[str]:
+    """Read `src` and write the data read to `dst`, e.g. to convert its format.
+
+    The arrays returned by the reader are handed to the writer by reference,
+    without being copied.
+
+    Parameters
+    ----------
+    src : str or list of str
+        Path(s) to read.
+    dst : str
+        The path to write.
+    stack : bool
+        Should the readers stack the read files, by default False.
+    lazy : bool
+        Prefer readers that return lazy data, by default False.  See `read`.
+    reader_plugin : str, optional
+        Name of the plugin to read data with, by default any compatible plugin.
+    writer_plugin : str, optional
+        Name of the plugin to write data with, by default any compatible plugin.
+
+    Returns
+    -------
+    list of str
+        List of file paths that were written
+
+    Raises
+    ------
+    ValueError
+        If no reader returns data, or no suitable writer is found.
+    """
+    layer_data = _read(
+        [src] if isinstance(src, str) else src,
+        stack=stack,
+        lazy=lazy,
+        plugin_name=reader_plugin,
+    )
+    layers: List[Union[FullLayerData, napari.layers.Layer]] = [
+        LayerDataTuple.from_layer_data(ld)
+        for ld in layer_data
+        if ld and ld[0] is not None  # (`[(None,)]` means "no data")
+    ]
+    if not layers:
+        raise ValueError(f"No data was read from {src!r}")
+    return _write(dst, layers, plugin_name=writer_plugin)
+
+
 # -----------------------------------------------------------------------------------
 
 
@@ -124,8 +346,11 @@ def _read(
     *,
     stack: bool,
     plugin_name: Optional[str] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
     return_reader: Literal[False] = False,
     _pm=None,
+    _readers=None,
 ) -> List[LayerData]:
     ...
 
@@ -136,8 +361,11 @@ def _read(
     *,
     stack: bool,
     plugin_name: Optional[str] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
     return_reader: Literal[True],
     _pm=None,
+    _readers=None,
 ) -> Tuple[List[LayerData], ReaderContribution]:
     ...
 
@@ -147,23 +375,57 @@ def _read(
     *,
     stack: bool,
     plugin_name: Optional[str] = None,
+    lazy: bool = False,
+    timeout: Optional[float] = None,
     return_reader: bool = False,
     _pm: Optional[PluginManager] = None,
+    _readers: Optional[Sequence[ReaderContribution]] = None,
 ) -> Union[Tuple[List[LayerData], ReaderContribution], List[LayerData]]:
-    """Execute the `read...` functions above."""
+    """Execute the `read...` functions above.
+
+    `_readers` are the readers to try, in order (by default, `_iter_readers`).
+    """
     if _pm is None:
         _pm = PluginManager.instance()
 
-    for rdr in _pm.iter_compatible_readers(paths):
-        if plugin_name and rdr.plugin_name != plugin_name:
-            continue
+    registry = _pm.commands
+
+    def _call(rdr: ReaderContribution) -> Optional[List[LayerData]]:
         read_func = rdr.exec(
-            kwargs={"path": paths, "stack": stack, "_registry": _pm.commands}
+            kwargs={"path": paths, "stack": stack, "_registry": registry}
         )
-        if read_func is not None:
-            # if the reader function raises an exception here, we don't try to catch it
-            if layer_data := read_func(paths, stack=stack):
-                return (layer_data, rdr) if return_reader else layer_data
+        # if the reader function raises an exception here, we don't try to catch it
+        return read_func(paths, stack=stack) if read_func is not None else None
+
+    def _try(rdr: ReaderContribution) -> Optional[List[LayerData]]:
+        if timeout is None:
+            layer_data = _call(rdr)
+        else:
+            future = _call_in_thread(partial(_call, rdr))
+            # (not `future.result(timeout)`: the reader may raise `TimeoutError`)
+            if wait([future], timeout).done:
+                layer_data = future.result()
+            else:
+                warnings.warn(
+                    f"Reader {rdr.command!r} did not return within {timeout} "
+                    f"seconds for {paths!r}; trying the next compatible reader.",
+                    stacklevel=2,
+                )
+                layer_data = None
+        _reader_stats.record(key, rdr, success=bool(layer_data))
+        return layer_data or None
+
+    key = _reader_stats.key_for(paths)
+    _paths = [paths] if isinstance(paths, str) else list(paths)
+    readers: Iterable[ReaderContribution] = (
+        _iter_readers(_pm, _paths, stack, plugin_name, lazy)
+        if _readers is None
+        else _readers
+    )
+    for rdr in readers:
+        if layer_data := _try(rdr):
+            _pm._contrib.set_last_reader(_paths, stack, rdr, lazy)
+            return (layer_data, rdr) if return_reader else layer_data
 
     if plugin_name:
         raise ValueError(
@@ -210,13 +472,8 @@ def _write(
     if _pm is None:
         _pm = PluginManager.instance()
 
-    _layer_tuples: List[FullLayerData] = [
-        cast("napari.layers.Layer", x).as_layer_data_tuple()
-        if hasattr(x, "as_layer_data_tuple")
-        else x
-        for x in layer_data
-    ]
-    layer_types = [x[2] for x in _layer_tuples]
+    # select the writer with the (cheap) layer types, before converting any layer
+    layer_types = [_layer_type(x) for x in layer_data]
     writer, new_path = _pm.get_writer(
         path, layer_types=layer_types, plugin_name=plugin_name
     )
@@ -227,10 +484,85 @@ def _write(
     # Writers that take at most one layer must use the single-layer api.
     # Otherwise, they must use the multi-layer api.
     n = sum(ltc.max() for ltc in writer.layer_type_constraints())
+    _layer_tuples = [
+        _as_layer_tuple(x) for x in (layer_data[:1] if n <= 1 else layer_data)
+    ]
+    if writer.streaming:
+        _layer_tuples = [(_chunked(d), m, t) for d, m, t in _layer_tuples]
     args = (new_path, *_layer_tuples[0][:2]) if n <= 1 else (new_path, _layer_tuples)
-    res = writer.exec(args=args)
+    res = writer.exec(args=args, _registry=_pm.commands)
 
     # napari_get_writer-style writers don't always return a list
     # though strictly speaking they should?
     result = [res] if isinstance(res, str) else res or []  # type: ignore
     return (result, writer) if return_writer else result
+
+
+def _iter_readers(
+    _pm: PluginManager,
+    paths: List[str],
+    stack: bool,
+    plugin_name: Optional[str],
+    lazy: bool,
+) -> Iterator[ReaderContribution]:
+    """Yield the readers to try for `paths`, in order (looked up lazily)."""
+    # first, the reader that last returned data for the same kind of paths
+    last = _pm._contrib.last_reader(paths, stack, lazy)
+    if last is not None and not (plugin_name and last.plugin_name != plugin_name):
+        yield last
+
+    # then, readers that returned data for this extension before
+    key = _reader_stats.key_for(paths)
+    readers = _reader_stats.sort_readers(key, list(_pm.iter_compatible_readers(paths)))
+    if lazy:  # (stable, so lazy readers are still ordered as above)
+        readers.sort(key=lambda rdr: not rdr.lazy)
+    for rdr in readers:
+        if rdr is not last and not (plugin_name and rdr.plugin_name != plugin_name):
+            yield rdr
+
+
+class _ReaderGroup:
+    """Readers to try for a group of similar paths, in `read_many`."""
+
+    def __init__(self) -> None:
+        self.readers: Optional[List[ReaderContribution]] = None
+        # set once the first item of the group was read (or failed)
+        self.resolved = threading.Event()
+
+
+def _call_in_thread(func: Callable[[], T]) -> Future[T]:
+    """Call `func` in a worker thread, and return a future of its result.
+
+    The worker (a daemon thread) can't be stopped: if the caller stops waiting for
+    the result, it is left to finish alone.
+    """
+    future: Future[T] = Future()
+
+    def _run():
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run, name="npe2-reader", daemon=True).start()
+    return future
+
+
+def _layer_type(layer: Union[FullLayerData, napari.layers.Layer]) -> str:
+    """Return the type name of `layer`, without converting napari layers."""
+    if hasattr(layer, "as_layer_data_tuple"):
+        return getattr(layer, "_type_string", None) or type(layer).__name__.lower()
+    return cast(FullLayerData, layer)[2]
+
+
+def _as_layer_tuple(layer: Union[FullLayerData, napari.layers.Layer]) -> FullLayerData:
+    if hasattr(layer, "as_layer_data_tuple"):
+        return cast("napari.layers.Layer", layer).as_layer_data_tuple()
+    return cast(FullLayerData, layer)
+
+
+def _chunked(data):
+    """Wrap array-like `data` for streaming writers (see `ChunkedData`)."""
+    if hasattr(data, "shape") and hasattr(data, "dtype"):
+        return ChunkedData(data)
+    return data  # e.g. multiscale, or non-array data
@@ -1,11 +1,31 @@
+import contextlib
+import hashlib
 import json
+import logging
+import os
+import pickle
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Dict, Optional, Union
+from typing import IO, Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
 import yaml
+from appdirs import user_cache_dir
 from pydantic import BaseModel, PrivateAttr
 
+try:  # use the (much faster) libyaml bindings when PyYAML was built with them
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader  # type: ignore [assignment]
+
+logger = logging.getLogger(__name__)
+# pre-validated models parsed by `ImportExportModel.from_file`
+COMPILED_CACHE = Path(user_cache_dir("napari", "napari")) / "npe2" / "compiled"
+# if set, no npe2 cache file is read or written
+NPE2_NOCACHE = "NPE2_NOCACHE"
+T = TypeVar("T")
+
 
 class ImportExportModel(BaseModel):
     """Model mixin/base class that provides read/write from toml/yaml/json.
@@ -44,7 +64,7 @@ class ImportExportModel(BaseModel):
         **kwargs
             passed to `BaseModel.json()`
         """
-        return yaml.safe_dump(self._serialized_data(**kwargs), sort_keys=False)
+        return yaml_dump(self._serialized_data(**kwargs))
 
     @classmethod
     def from_file(cls, path: Union[Path, str]):
@@ -55,6 +75,11 @@ class ImportExportModel(BaseModel):
         path : Path or str
             Path to file.  Must have extension {'.json', '.yaml', '.yml', '.toml'}
 
+        Successfully parsed and validated models are stored in a binary cache
+        (keyed on the path, modification time and size of `path`), and are
+        loaded from that cache on subsequent calls -- skipping both parsing and
+        validation -- for as long as the file is unchanged.
+
         Returns
         -------
         object
@@ -82,10 +107,14 @@ class ImportExportModel(BaseModel):
 
             loader = tomllib.load
         elif path.suffix.lower() in (".yaml", ".yml"):
-            loader = yaml.safe_load
+            loader = yaml_load
         else:
             raise ValueError(f"unrecognized file extension: {path}")  # pragma: no cover
 
+        cache_key = _compiled_cache_key(cls, path)
+        if (cached := _load_compiled(cls, cache_key)) is not None:
+            return cached
+
         with open(path, mode="rb") as f:
             data = loader(f) or {}
 
@@ -94,6 +123,7 @@ class ImportExportModel(BaseModel):
 
         obj = cls(**data)
         obj._source_file = Path(path).expanduser().absolute().resolve()
+        _save_compiled(cache_key, obj)
         return obj
 
     def _serialized_data(self, **kwargs):
@@ -117,3 +147,89 @@ class ImportExportModel(BaseModel):
             for f in required:
                 if not was_there.get(f):
                     self.__fields_set__.discard(f)
+
+
+def yaml_load(stream: Any) -> Any:
+    """Equivalent to `yaml.safe_load`, using libyaml if available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def yaml_dump(data: Any) -> str:
+    """Equivalent to `yaml.safe_dump(data, sort_keys=False)`, using libyaml if
+    available."""
+    return yaml.dump(data, Dumper=SafeDumper, sort_keys=False)
+
+
+def _compiled_cache_key(cls: type, path: Path) -> Tuple[Any, ...]:
+    from npe2 import __version__
+
+    st = path.stat()
+    return (
+        __version__,
+        cls.__module__,
+        cls.__qualname__,
+        str(path),
+        st.st_mtime_ns,
+        st.st_size,
+    )
+
+
+def _compiled_cache_path(key: Tuple[Any, ...]) -> Path:
+    # one file per (model class, source path): the version, mtime and size parts
+    # of the key are checked when loading, and stale entries are overwritten.
+    name = hashlib.sha1(repr(key[1:4]).encode()).hexdigest()
+    return COMPILED_CACHE / f"{name}.pickle"
+
+
+def _load_compiled(cls: type, key: Tuple[Any, ...]) -> Optional[Any]:
+    """Return the cached (already validated) model for `key`, if any."""
+    path = _compiled_cache_path(key)
+    if (cached := load_cache_file(path, pickle.load)) is None:
+        return None
+    cached_key, obj = cached
+    return obj if cached_key == key and isinstance(obj, cls) else None
+
+
+def _save_compiled(key: Tuple[Any, ...], obj: Any) -> None:
+    if os.getenv(NPE2_NOCACHE):
+        return
+    data = pickle.dumps((key, obj), protocol=pickle.HIGHEST_PROTOCOL)
+    save_cache_file(_compiled_cache_path(key), data)
+
+
+def load_cache_file(path: Path, load: Callable[[IO[bytes]], T]) -> Optional[T]:
+    """Return `load(file)` for the cache file at `path`.
+
+    Returns `None` if caching is disabled (see `NPE2_NOCACHE`), or if the file is
+    missing or can't be loaded.
+    """
+    if os.getenv(NPE2_NOCACHE):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # corrupt file, or objects from an incompatible version
+        logger.debug("Could not load npe2 cache file %s: %s", path, e)
+        return None
+
+
+def save_cache_file(path: Path, data: bytes) -> None:
+    """Write `data` to the cache file at `path`, unless caching is disabled.
+
+    The data is written to a temporary file (unique to this process and thread),
+    which then replaces `path`, so that readers never see a partially written file.
+    Errors are logged, not raised.
+    """
+    if os.getenv(NPE2_NOCACHE):
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.debug("Could not save npe2 cache file %s: %s", path, e)
+        with contextlib.suppress(OSError):
+            tmp.unlink()
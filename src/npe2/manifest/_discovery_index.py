@@ -0,0 +1,125 @@
+"""Persistent on-disk index of the results of `PluginManifest.discover`.
+
+Scanning every installed distribution and parsing every plugin manifest is the
+bulk of plugin discovery time in large environments.  This module stores the
+(successful) results of a full discovery scan in a single file, along with a
+cheap fingerprint of the environment: the names and modification times of all
+`*.dist-info` (and `*.egg-info`) directories found on `sys.path`.  As long as
+that fingerprint (and the mtime of each manifest file) is unchanged, the stored
+results are returned without scanning the environment.
+
+The index may be disabled by setting the `NPE2_NOCACHE` environment variable.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from appdirs import user_cache_dir
+
+from ._bases import NPE2_NOCACHE, load_cache_file, save_cache_file
+
+if TYPE_CHECKING:
+    from .schema import DiscoverResults, PluginManifest
+
+logger = logging.getLogger(__name__)
+DISCOVERY_INDEX = Path(user_cache_dir("napari", "napari")) / "npe2" / "discovery_index"
+_METADATA_DIR_SUFFIXES = (".dist-info", ".egg-info")
+
+# (distribution path, manifest or None for npe1 adapters, manifest file mtime)
+_IndexEntry = Tuple[str, Optional["PluginManifest"], Optional[int]]
+
+
+def environment_fingerprint() -> str:
+    """Return a hash of all python package metadata directories on `sys.path`."""
+    from npe2 import __version__
+
+    from .schema import SCHEMA_VERSION
+
+    sha = hashlib.sha1(f"{__version__}:{SCHEMA_VERSION}".encode())
+    for entry in sys.path:
+        sha.update(entry.encode(errors="surrogateescape"))
+        with contextlib.suppress(OSError):
+            with os.scandir(entry or ".") as it:
+                for dirent in sorted(it, key=lambda d: d.name):
+                    if dirent.name.endswith(_METADATA_DIR_SUFFIXES):
+                        mtime = dirent.stat().st_mtime_ns
+                        sha.update(f"{dirent.name}:{mtime}".encode())
+    return sha.hexdigest()
+
+
+def clear() -> List[Path]:
+    """Delete the discovery index, returning the list of paths removed."""
+    if DISCOVERY_INDEX.exists():
+        DISCOVERY_INDEX.unlink()
+        return [DISCOVERY_INDEX]
+    return []
+
+
+def load() -> Optional[List[DiscoverResults]]:
+    """Return previously stored discovery results, if still valid.
+
+    Returns `None` if the index is missing, disabled, unreadable, or stale.
+    """
+    if (index := load_cache_file(DISCOVERY_INDEX, pickle.load)) is None:
+        return None
+
+    fingerprint, entries = index
+    if fingerprint != environment_fingerprint():
+        return None
+
+    from ._npe1_adapter import NPE1Adapter
+    from .schema import DiscoverResults
+
+    results: List[DiscoverResults] = []
+    for dist_path, mf, mtime in entries:
+        dist = metadata.PathDistribution(Path(dist_path))
+        if mf is None:
+            results.append(DiscoverResults(NPE1Adapter(dist=dist), dist, None))
+            continue
+        if _mtime(mf._source_file) != mtime:
+            return None  # manifest was edited (e.g. an editable install)
+        results.append(DiscoverResults(mf, dist, None))
+    logger.debug("%d plugins loaded from npe2 discovery index", len(results))
+    return results
+
+
+def save(results: Iterable[DiscoverResults]) -> None:
+    """Store the results of a full discovery scan.
+
+    Nothing is stored if any of the results is an error (so that the error is
+    reported again on the next discovery), or if any distribution is not a
+    plain `PathDistribution` that can be recreated from its path.
+    """
+    if os.getenv(NPE2_NOCACHE):
+        return
+
+    from ._npe1_adapter import NPE1Adapter
+
+    entries: List[_IndexEntry] = []
+    for result in results:
+        dist_path = getattr(result.distribution, "_path", None)
+        if result.error or result.manifest is None or dist_path is None:
+            return
+        if isinstance(result.manifest, NPE1Adapter):
+            entries.append((str(dist_path), None, None))
+        else:
+            mf = result.manifest
+            entries.append((str(dist_path), mf, _mtime(mf._source_file)))
+
+    data = pickle.dumps((environment_fingerprint(), entries), protocol=-1)
+    save_cache_file(DISCOVERY_INDEX, data)
+
+
+def _mtime(path: Optional[Path]) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns if path else None
+    except OSError:
+        return None
@@ -10,14 +10,16 @@ from typing import List, Sequence
 
 from appdirs import user_cache_dir
 
+from npe2 import _reader_stats
 from npe2._inspection._from_npe1 import manifest_from_npe1
 from npe2.manifest import PackageMetadata
 
+from . import _bases, _discovery_index
+from ._bases import NPE2_NOCACHE
 from .schema import PluginManifest, discovery_blocked
 
 logger = logging.getLogger(__name__)
 ADAPTER_CACHE = Path(user_cache_dir("napari", "napari")) / "npe2" / "adapter_manifests"
-NPE2_NOCACHE = "NPE2_NOCACHE"
 
 
 def clear_cache(names: Sequence[str] = ()) -> List[Path]:
@@ -26,7 +28,8 @@ def clear_cache(names: Sequence[str] = ()) -> List[Path]:
     Parameters
     ----------
     names : Sequence[str], optional
-        selection of plugin names to clear, by default, all will be cleared
+        selection of plugin names to clear, by default, all will be cleared (along
+        with the discovery index)
 
     Returns
     -------
@@ -43,6 +46,12 @@ def clear_cache(names: Sequence[str] = ()) -> List[Path]:
         else:
             _cleared = list(ADAPTER_CACHE.iterdir())
             rmtree(ADAPTER_CACHE)
+    if not names:
+        _cleared.extend(_discovery_index.clear())
+        _cleared.extend(_reader_stats.clear())
+        if _bases.COMPILED_CACHE.exists():
+            _cleared.extend(_bases.COMPILED_CACHE.iterdir())
+            rmtree(_bases.COMPILED_CACHE)
     return _cleared
 
 
@@ -28,13 +28,26 @@ class ReaderContribution(Executable[Optional[ReaderFunction]]):
     accepts_directories: bool = Field(
         False, description="Whether this reader accepts directories"
     )
+    lazy: bool = Field(
+        default=False,
+        description="Whether this reader returns lazy data: array-like objects "
+        "(such as memory-mapped, zarr or dask arrays) that load their data on "
+        "demand, rather than in-memory arrays. Lazy readers are preferred when "
+        "data is opened with `lazy=True`, e.g. for datasets that do not fit in "
+        "memory.",
+    )
 
     class Config:
         extra = Extra.forbid
 
     def __hash__(self):
         return hash(
-            (self.command, tuple(self.filename_patterns), self.accepts_directories)
+            (
+                self.command,
+                tuple(self.filename_patterns),
+                self.accepts_directories,
+                self.lazy,
+            )
         )
 
     def exec(self, *, kwargs):
@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Type
 
-from pydantic import BaseModel, Extra, Field, validator
+from pydantic import BaseModel, Extra, Field, PrivateAttr, validator
 
 from npe2.manifest.utils import Executable
 
@@ -59,6 +59,10 @@ class LayerTypeConstraint(BaseModel):
         "layers of `layer_type`",
     )
 
+    class Config:
+        # instances are interned by `from_str`, and shared by all writers
+        allow_mutation = False
+
     @validator("bounds")
     def check_bounds(cls, v):
         mn, mx = v
@@ -68,7 +72,7 @@ class LayerTypeConstraint(BaseModel):
 
     @classmethod
     def zero(cls, layer_type: LayerType) -> "LayerTypeConstraint":
-        return cls(layer_type=layer_type, bounds=(0, 1))
+        return cls.from_str(f"{LayerType(layer_type).value}{{0}}")
 
     def is_zero(self) -> bool:
         return self.bounds == (0, 1)
@@ -88,7 +92,16 @@ class LayerTypeConstraint(BaseModel):
         '*' means 0 or more.
         '{k}' means exactly k.
         '{m,n}' means between m and n (inclusive).
+
+        Results are cached, and shared (instances are immutable).
         """
+        key = (cls, expr)
+        if (constraint := _CONSTRAINT_CACHE.get(key)) is None:
+            constraint = _CONSTRAINT_CACHE[key] = cls._parse(expr)
+        return constraint
+
+    @classmethod
+    def _parse(cls, expr: str) -> "LayerTypeConstraint":
         # Writers won't accept more than this number of layers.
         MAX_LAYERS = 1 << 32
 
@@ -114,6 +127,10 @@ class LayerTypeConstraint(BaseModel):
         return cls(layer_type=lt, bounds=bounds)
 
 
+# interned results of `LayerTypeConstraint.from_str`
+_CONSTRAINT_CACHE: Dict[Tuple[Type[LayerTypeConstraint], str], LayerTypeConstraint] = {}
+
+
 class WriterContribution(Executable[List[str]]):
     r"""Contribute a layer writer.
 
@@ -150,11 +167,28 @@ class WriterContribution(Executable[List[str]]):
         "along side the plugin name and may be used to distinguish the kind of "
         "writer for the user. E.g. “lossy” or “lossless”.",
     )
+    streaming: bool = Field(
+        default=False,
+        description="Whether this writer accepts layer data in chunks. If `True`, "
+        "the writer receives a `npe2.types.ChunkedData` (with `shape` and `dtype` "
+        "attributes, yielding `(index, chunk)` pairs) in place of the data of each "
+        "array-like layer, so that layers larger than memory can be written.",
+    )
+    _constraints: Optional[
+        Tuple[Tuple[str, ...], List[LayerTypeConstraint]]
+    ] = PrivateAttr(None)
 
     def layer_type_constraints(self) -> List[LayerTypeConstraint]:
-        spec = [LayerTypeConstraint.from_str(lt) for lt in self.layer_types]
-        unspecified_types = set(LayerType) - {lt.layer_type for lt in spec}
-        return spec + [LayerTypeConstraint.zero(lt) for lt in unspecified_types]
+        # cached, and recomputed only if `layer_types` is changed
+        key = tuple(self.layer_types)
+        if self._constraints is None or self._constraints[0] != key:
+            spec = [LayerTypeConstraint.from_str(lt) for lt in key]
+            specified = {c.layer_type for c in spec}
+            zeros = [
+                LayerTypeConstraint.zero(lt) for lt in LayerType if lt not in specified
+            ]
+            self._constraints = (key, spec + zeros)
+        return list(self._constraints[1])
 
     def __hash__(self):
         return hash(
@@ -163,6 +197,7 @@ class WriterContribution(Executable[List[str]]):
                 str(self.layer_types),
                 str(self.filename_extensions),
                 self.display_name,
+                self.streaming,
             )
         )
 
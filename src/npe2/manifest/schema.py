@@ -203,12 +203,15 @@ class PluginManifest(ImportExportModel):
         hide_docs=True,
     )
 
+    # if `package_metadata` is not provided, it is populated from the installed
+    # distribution lazily, on first access (parsing METADATA is expensive, and
+    # rarely needed).  Until then, it is left out of `__dict__`, so that only
+    # `__getattr__` (which runs on misses only) has to deal with it.
+
     def __init__(self, **data):
         super().__init__(**data)
-        if self.package_metadata is None and self.name:
-            with suppress(metadata.PackageNotFoundError):
-                meta = metadata.distribution(self.name).metadata
-                self.package_metadata = PackageMetadata.from_dist_metadata(meta)
+        if self.package_metadata is None:
+            del self.__dict__["package_metadata"]
 
         if not self.npe1_shim:
             # assign plugin name on all contributions that have a private
@@ -218,6 +221,32 @@ class PluginManifest(ImportExportModel):
                     if isinstance(item, Executable):
                         item._plugin_name = self.name
 
+    def __getattr__(self, __name: str):
+        if __name == "package_metadata":
+            return self._resolve_package_metadata()
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {__name!r}"
+        )
+
+    def _iter(self, *args, **kwargs):
+        # make sure `dict()`, `json()`, `copy()`, `==`, etc... see package_metadata
+        if "package_metadata" not in self.__dict__:
+            self._resolve_package_metadata()
+        return super()._iter(*args, **kwargs)
+
+    def _resolve_package_metadata(self) -> Optional[PackageMetadata]:
+        """Populate package_metadata from the installed distribution, once."""
+        meta = None
+        try:
+            if self.name:
+                with suppress(metadata.PackageNotFoundError):
+                    dist_meta = metadata.distribution(self.name).metadata
+                    meta = PackageMetadata.from_dist_metadata(dist_meta)
+        finally:
+            # (threads resolving it concurrently all get the first result)
+            meta = self.__dict__.setdefault("package_metadata", meta)
+        return meta
+
     def __hash__(self):
         return hash((self.name, self.package_version))
 
@@ -317,7 +346,7 @@ class PluginManifest(ImportExportModel):
 
     @classmethod
     def discover(
-        cls, paths: Sequence[Union[str, Path]] = ()
+        cls, paths: Sequence[Union[str, Path]] = (), workers: Optional[int] = None
     ) -> Iterator[DiscoverResults]:
         """Discover manifests in the environment.
 
@@ -341,38 +370,37 @@ class PluginManifest(ImportExportModel):
 
         [1]: https://packaging.python.org/specifications/entry-points/
 
+        Results of a successful scan are stored in a persistent discovery index
+        (see `npe2.manifest._discovery_index`), and are reused by subsequent calls
+        as long as no package metadata directory on `sys.path` has changed.
+
         Parameters
         ----------
         paths : Sequence[str], optional
             paths to add to sys.path while discovering.
+        workers : int, optional
+            If greater than 1, parse and validate plugin manifests in a thread pool
+            with this many workers.  Results are yielded in the same (deterministic)
+            order as a serial scan.  By default, manifests are parsed serially.
 
         Yields
         ------
         DiscoverResults: (3 namedtuples: manifest, entrypoint, error)
             3-tuples with either manifest or (entrypoint and error) being None.
         """
+        from . import _discovery_index
+
         with _temporary_path_additions(paths):
-            for dist in metadata.distributions():
-                try:
-                    pm = _from_dist(dist)
-                    if pm:
-                        yield DiscoverResults(pm, dist, None)
-                except ValidationError as e:
-                    logger.warning(
-                        "Invalid schema for package %r, please run"
-                        " 'npe2 validate %s' to check for manifest errors.",
-                        dist.metadata["Name"],
-                        dist.metadata["Name"],
-                    )
-                    yield DiscoverResults(None, dist, e)
-
-                except Exception as e:
-                    logger.error(
-                        "{} -> {!r} could not be imported: {}".format(
-                            ENTRY_POINT, dist.metadata["Name"], e
-                        )
-                    )
-                    yield DiscoverResults(None, dist, e)
+            cached = _discovery_index.load()
+            if cached is not None:
+                yield from cached
+                return
+
+            results: List[DiscoverResults] = []
+            for result in _discover_distributions(workers):
+                results.append(result)
+                yield result
+            _discovery_index.save(results)
 
     @classmethod
     def _from_entrypoint(
@@ -381,36 +409,21 @@ class PluginManifest(ImportExportModel):
         distribution: Optional[metadata.Distribution] = None,
     ) -> PluginManifest:
         assert (match := entry_point.pattern.match(entry_point.value))
-        module = match.group("module")
-
-        spec = util.find_spec(module or "")
-        if not spec:  # pragma: no cover
-            raise ValueError(
-                f"Cannot find module {module!r} declared in "
-                f"entrypoint: {entry_point.value!r}"
-            )
-
-        assert (match := entry_point.pattern.match(entry_point.value))
-        fname = match.group("attr")
-
-        for loc in spec.submodule_search_locations or []:
-            mf_file = Path(loc) / fname
-            if mf_file.exists():
-                mf = PluginManifest.from_file(mf_file)
-                if distribution is not None:
-                    meta = PackageMetadata.from_dist_metadata(distribution.metadata)
-                    mf.package_metadata = meta
-
-                    if mf.name != meta.name:
-                        raise ValueError(  # pragma: no cover
-                            f"The name field in the manifest ({mf.name!r}) "
-                            f"must match the package name ({meta.name!r})"
-                        )
-                    return mf
-
-        raise FileNotFoundError(  # pragma: no cover
-            f"Could not find file {fname!r} in module {module!r}"
-        )
+        module: str = match.group("module") or ""
+        fname: str = match.group("attr")
+
+        mf_file = _locate_manifest_file(module, fname, distribution)
+        mf = PluginManifest.from_file(mf_file)
+        if distribution is not None:
+            meta = PackageMetadata.from_dist_metadata(distribution.metadata)
+            mf.package_metadata = meta
+
+            if mf.name != meta.name:
+                raise ValueError(  # pragma: no cover
+                    f"The name field in the manifest ({mf.name!r}) "
+                    f"must match the package name ({meta.name!r})"
+                )
+        return mf
 
     @classmethod
     def _from_package_or_name(
@@ -516,6 +529,102 @@ def _temporary_path_additions(paths: Sequence[Union[str, Path]] = ()):
             sys.path.remove(str(p))
 
 
+def _discover_distributions(workers: Optional[int] = None) -> Iterator[DiscoverResults]:
+    """Scan all installed distributions for plugin manifests.
+
+    If `workers` is greater than 1, candidate manifests are parsed and validated
+    in a thread pool.  Results are yielded in the same order in either case.
+    """
+    candidates = (d for d in metadata.distributions() if _has_plugin_entry_point(d))
+    if workers is not None and workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # (in order, each result as soon as it and the previous ones are done)
+            results = pool.map(_discover_distribution, candidates)
+            yield from (r for r in results if r is not None)
+    else:
+        results = map(_discover_distribution, candidates)
+        yield from (r for r in results if r is not None)
+
+
+def _discover_distribution(dist: metadata.Distribution) -> Optional[DiscoverResults]:
+    try:
+        pm = _from_dist(dist)
+        return DiscoverResults(pm, dist, None) if pm else None
+    except ValidationError as e:
+        logger.warning(
+            "Invalid schema for package %r, please run"
+            " 'npe2 validate %s' to check for manifest errors.",
+            dist.metadata["Name"],
+            dist.metadata["Name"],
+        )
+        return DiscoverResults(None, dist, e)
+
+    except Exception as e:
+        logger.error(
+            "{} -> {!r} could not be imported: {}".format(
+                ENTRY_POINT, dist.metadata["Name"], e
+            )
+        )
+        return DiscoverResults(None, dist, e)
+
+
+def _locate_manifest_file(
+    module: str, fname: str, distribution: Optional[metadata.Distribution] = None
+) -> Path:
+    """Find manifest file `fname` inside `module`, without importing anything.
+
+    The file is looked up (in order):
+
+    1. relative to the distribution's install location (`dist.locate_file`),
+    2. relative to each entry on `sys.path` (e.g. for editable installs),
+    3. in the search locations of the *top-level* package's import spec (which,
+       unlike `find_spec` on a dotted name, never imports any parent package).
+    """
+    top_level, *submodules = module.split(".")
+    rel_path = Path(*module.split("."), fname)
+
+    candidates: List[Path] = []
+    if distribution is not None:
+        candidates.append(Path(distribution.locate_file(rel_path)))
+    candidates.extend(Path(entry or ".") / rel_path for entry in sys.path)
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+
+    spec = util.find_spec(top_level) if top_level else None
+    if not spec:
+        raise ValueError(
+            f"Cannot find module {module!r} declared in entrypoint: {module}:{fname}"
+        )
+    for loc in spec.submodule_search_locations or []:
+        candidate = Path(loc, *submodules, fname)
+        if candidate.is_file():
+            return candidate
+
+    raise FileNotFoundError(  # pragma: no cover
+        f"Could not find file {fname!r} in module {module!r}"
+    )
+
+
+def _has_plugin_entry_point(dist: metadata.Distribution) -> bool:
+    """Cheap pre-filter: whether `dist` *may* declare a napari entry point.
+
+    This only checks the raw text of `entry_points.txt` (without parsing it, or
+    reading any other metadata), so that the vast majority of installed packages
+    (that are not napari plugins) can be skipped quickly.  `_from_dist` performs
+    the actual entry point parsing for the remaining candidates.
+    """
+    try:
+        text = dist.read_text("entry_points.txt")
+    except Exception:  # pragma: no cover
+        return True  # let `_from_dist` deal with (and report) the problem
+    if not text:
+        return False
+    return ENTRY_POINT in text or NPE1_ENTRY_POINT in text
+
+
 def _from_dist(dist: metadata.Distribution) -> Optional[PluginManifest]:
     """Return PluginManifest or NPE1Adapter for a metadata.Distribution object.
 
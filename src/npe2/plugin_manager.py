@@ -5,12 +5,25 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from os import PathLike
-    from typing import Any, Iterator, List, NewType, Optional, Sequence, Tuple, Union
+    from typing import (
+        Any,
+        Callable,
+        Iterable,
+        Iterator,
+        List,
+        NewType,
+        Optional,
+        Sequence,
+        Tuple,
+        Union,
+    )
 
     from npe2 import PluginManifest
     from npe2._plugin_manager import InclusionSet, PluginContext
     from npe2.manifest import contributions
+    from npe2.manifest.schema import DiscoverResults
 
     from ._plugin_manager import PluginManager
 
@@ -24,10 +37,25 @@ def instance() -> PluginManager:
     return PluginManager.instance()
 
 
-def discover(paths: Sequence[str] = (), clear=False, include_npe1=False) -> None:
+def discover(
+    paths: Sequence[str] = (),
+    clear=False,
+    include_npe1=False,
+    workers: Optional[int] = None,
+) -> None:
     """Discover and index plugin manifests in the environment."""
 
 
+def discover_async(
+    paths: Sequence[str] = (),
+    clear=False,
+    include_npe1=False,
+    workers: Optional[int] = None,
+    callback: Optional[Callable[[DiscoverResults], Any]] = None,
+) -> Future[int]:
+    """Discover and index plugin manifests in a background thread."""
+
+
 def dict(
     self,
     *,
@@ -45,10 +73,20 @@ def register(manifest: PluginManifest, warn_disabled=True) -> None:
     """Register a plugin manifest"""
 
 
+def register_many(
+    manifests: Iterable[Union[PluginManifest, str]], warn_disabled=True
+) -> None:
+    """Register many plugin manifests (or paths, or package names) at once."""
+
+
 def unregister(key: PluginName) -> None:
     """Unregister plugin named `key`."""
 
 
+def unregister_many(keys: Iterable[PluginName]) -> None:
+    """Unregister all plugins named in `keys`."""
+
+
 def activate(key: PluginName) -> PluginContext:
     """Activate plugin with `key`."""
 
@@ -61,6 +99,14 @@ def deactivate(plugin_name: PluginName) -> None:
     """Deactivate `plugin_name`"""
 
 
+def prefetch(
+    commands: Optional[Iterable[str]] = None,
+    plugins: Optional[Iterable[PluginName]] = None,
+    max_workers: Optional[int] = None,
+) -> Future[Dict[str, BaseException]]:
+    """Import the `python_name` of commands in background threads."""
+
+
 def enable(plugin_name: PluginName) -> None:
     """Enable a plugin (which mostly means just `un-disable` it."""
 
@@ -1,9 +1,13 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     TYPE_CHECKING,
     Callable,
     Dict,
+    Iterator,
     List,
     Literal,
+    NamedTuple,
     NewType,
     Optional,
     Protocol,
@@ -53,6 +57,114 @@ DataType = Union[ArrayLike, Sequence[ArrayLike]]
 FullLayerData = Tuple[DataType, Metadata, LayerName]
 LayerData = Union[Tuple[DataType], Tuple[DataType, Metadata], FullLayerData]
 
+
+class LayerDataTuple(NamedTuple):
+    """A full layer data tuple, which holds its data by reference.
+
+    Being a tuple, it may be used wherever a `FullLayerData` is expected.  Creating
+    it (e.g. with `from_layer_data`) never copies the data arrays.
+    """
+
+    data: DataType
+    meta: Metadata
+    layer_type: LayerName
+
+    @classmethod
+    def from_layer_data(
+        cls, layer_data: LayerData, layer_type: LayerName = "image"
+    ) -> "LayerDataTuple":
+        """Complete a (possibly partial) layer data tuple, like napari does.
+
+        Missing metadata defaults to an empty dict, and a missing layer type to
+        `layer_type`.
+        """
+        if isinstance(layer_data, cls):
+            return layer_data
+        meta = layer_data[1] if len(layer_data) > 1 else {}  # type: ignore
+        type_ = layer_data[2] if len(layer_data) > 2 else layer_type  # type: ignore
+        return cls(layer_data[0], meta or {}, type_)
+
+    def buffers(self) -> List[memoryview]:
+        """Return memoryviews of the data arrays that support the buffer protocol.
+
+        Multiscale data gives a view for each level.  No data is copied: the views
+        share memory with (and keep alive) the arrays, e.g. to write their bytes.
+        """
+        arrays = self.data if isinstance(self.data, (list, tuple)) else [self.data]
+        views = []
+        for array in arrays:
+            try:
+                views.append(memoryview(array))
+            except TypeError:  # (e.g. lazy arrays)
+                continue
+        return views
+
+
+# target size of the chunks of `ChunkedData`, in bytes
+CHUNK_BYTES = 64 * 2**20
+
+
+class ChunkedData:
+    """Array data given in chunks to writers that declare `streaming: true`.
+
+    Iterating yields `(index, chunk)` pairs, where `index` is the tuple of slices
+    locating the in-memory `chunk` in the full array.  Arrays are split along their
+    first axis, following the array's own chunks (e.g. for dask or zarr arrays), or
+    in chunks of about `chunk_bytes` otherwise.  The next chunk is loaded in the
+    background while the current one is being written.
+    """
+
+    def __init__(self, data: ArrayLike, chunk_bytes: int = CHUNK_BYTES) -> None:
+        self.data = data
+        self.shape: Tuple[int, ...] = tuple(data.shape)
+        self.dtype = data.dtype
+        self._bounds = self._chunk_bounds(chunk_bytes)
+
+    def __repr__(self) -> str:
+        return f"ChunkedData(shape={self.shape}, dtype={self.dtype}, n={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[slice, ...], ArrayLike]]:
+        bounds = self._bounds
+        with ThreadPoolExecutor(1, thread_name_prefix="npe2-chunks") as pool:
+            future = pool.submit(self._load, bounds[0]) if bounds else None
+            for n, b in enumerate(bounds):
+                chunk = future.result()  # type: ignore
+                if n + 1 < len(bounds):  # read ahead
+                    future = pool.submit(self._load, bounds[n + 1])
+                yield self._index(b), chunk
+
+    def _index(self, bounds: Tuple[int, int]) -> Tuple[slice, ...]:
+        if not self.shape:
+            return ()
+        return (slice(*bounds), *(slice(0, n) for n in self.shape[1:]))
+
+    def _load(self, bounds: Tuple[int, int]) -> ArrayLike:
+        chunk = self.data[slice(*bounds)] if self.shape else self.data  # type: ignore
+        # (e.g. computes dask arrays; a no-op for numpy arrays)
+        return chunk.__array__() if hasattr(chunk, "__array__") else chunk
+
+    def _chunk_bounds(self, chunk_bytes: int) -> List[Tuple[int, int]]:
+        if not self.shape:
+            return [(0, 1)]
+        rows = self.shape[0]
+        chunks = getattr(self.data, "chunks", None)
+        if chunks and isinstance(chunks[0], tuple):  # dask: sizes of all chunks
+            stops = [0]
+            for size in chunks[0]:
+                stops.append(stops[-1] + size)
+            return [(a, b) for a, b in zip(stops, stops[1:]) if b > a] or [(0, 0)]
+        if chunks and isinstance(chunks[0], int):  # zarr: shape of one chunk
+            step = chunks[0]
+        else:
+            row_bytes = getattr(self.dtype, "itemsize", 1) * math.prod(self.shape[1:])
+            step = chunk_bytes // row_bytes if row_bytes else rows
+        step = max(1, step)
+        return [(i, min(i + step, rows)) for i in range(0, rows, step)] or [(0, 0)]
+
+
 # ########################## CONTRIBUTIONS #################################
 
 # WidgetContribution.command must point to a WidgetCreator
@@ -72,6 +184,8 @@ SampleDataCreator = Callable[..., List[LayerData]]
 # Otherwise, they must provide a MultiWriterFunction.
 # where the number of layers they take is defined as
 # n = sum(ltc.max() for ltc in WriterContribution.layer_type_constraints())
+# Writers that declare `streaming: true` receive a `ChunkedData` in place of the
+# data of each (array-like) layer.
 SingleWriterFunction = Callable[[str, DataType, Metadata], List[str]]
 MultiWriterFunction = Callable[[str, List[FullLayerData]], List[str]]
 WriterFunction = Union[SingleWriterFunction, MultiWriterFunction]
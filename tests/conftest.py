@@ -6,8 +6,8 @@ from unittest.mock import patch
 
 import pytest
 
-from npe2 import PluginManager, PluginManifest
-from npe2.manifest import _npe1_adapter
+from npe2 import PluginManager, PluginManifest, _reader_stats
+from npe2.manifest import _bases, _discovery_index, _npe1_adapter
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -177,3 +177,29 @@ def mock_cache(tmp_path, monkeypatch):
     with monkeypatch.context() as m:
         m.setattr(_npe1_adapter, "ADAPTER_CACHE", tmp_path)
         yield tmp_path
+
+
+@pytest.fixture(autouse=True)
+def mock_discovery_index(tmp_path_factory, monkeypatch):
+    index = tmp_path_factory.mktemp("discovery") / "discovery_index"
+    with monkeypatch.context() as m:
+        m.setattr(_discovery_index, "DISCOVERY_INDEX", index)
+        yield index
+
+
+@pytest.fixture(autouse=True)
+def mock_compiled_cache(tmp_path_factory, monkeypatch):
+    cache = tmp_path_factory.mktemp("compiled")
+    with monkeypatch.context() as m:
+        m.setattr(_bases, "COMPILED_CACHE", cache)
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def mock_reader_stats(tmp_path_factory, monkeypatch):
+    stats = tmp_path_factory.mktemp("reader_stats") / "reader_stats.json"
+    with monkeypatch.context() as m:
+        m.setattr(_reader_stats, "READER_STATS", stats)
+        m.setattr(_reader_stats, "_stats", None)
+        m.setattr(_reader_stats, "_dirty", False)
+        yield stats
@@ -1,18 +1,22 @@
 # extra underscore in name to run this first
+import json
 from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
 
 from npe2 import (
     DynamicPlugin,
     PluginManager,
+    convert,
     io_utils,
     read,
     read_get_reader,
+    read_many,
     write,
     write_get_writer,
 )
-from npe2.types import FullLayerData
+from npe2.types import ChunkedData, FullLayerData, LayerDataTuple
 
 SAMPLE_PLUGIN_NAME = "my-plugin"
 
@@ -62,6 +66,253 @@ def test_read_uses_correct_passed_plugin(tmp_path):
     io_utils._read(["some.fzzy"], plugin_name=short_name, stack=False, _pm=pm)
 
 
+def test_read_prefers_successful_readers(mock_reader_stats, monkeypatch):
+    from npe2 import _reader_stats
+
+    pm = PluginManager()
+    first = DynamicPlugin("first", plugin_manager=pm)
+    second = DynamicPlugin("second", plugin_manager=pm)
+    calls = []
+
+    @first.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader_first(path):
+        calls.append("first")
+        return None
+
+    @second.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader_second(path):
+        calls.append("second")
+        return lambda path: [(None,)]
+
+    for _ in range(3):
+        io_utils._read(["some.fzzy"], stack=False, _pm=pm)
+    assert calls == ["first", "second", "second", "second"]
+
+    # history is persisted, and reloaded
+    assert mock_reader_stats.exists()
+    monkeypatch.setattr(_reader_stats, "_stats", None)
+    calls.clear()
+    io_utils._read(["other.FZZY"], stack=False, _pm=pm)
+    assert calls == ["second"]
+
+    # readers that repeatedly failed go last
+    readers = list(pm.iter_compatible_readers("x.fzzy"))
+    for _ in range(2):
+        _reader_stats.record(".abc", readers[0], success=False)
+    assert _reader_stats.sort_readers(".abc", readers) == readers[::-1]
+    assert _reader_stats.clear() == [mock_reader_stats]
+    assert _reader_stats.sort_readers(".abc", readers) == readers
+
+
+def test_reader_stats_saved_lazily(mock_reader_stats, mock_cache):
+    from npe2 import _reader_stats
+    from npe2.manifest import _npe1_adapter
+
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader(path):
+        return lambda path: [(None,)]
+
+    with patch.object(_reader_stats, "_write", wraps=_reader_stats._write) as mock:
+        for _ in range(10):
+            io_utils._read(["some.fzzy"], stack=False, _pm=pm)
+        mock.assert_called_once()  # only when the reader's rank changed
+        assert _reader_stats._dirty
+        _reader_stats.save()  # (at exit)
+        assert mock.call_count == 2
+        _reader_stats.save()  # nothing new to save
+        assert mock.call_count == 2
+
+    history = json.loads(mock_reader_stats.read_text())
+    assert history == {".fzzy": {"plugin.get_reader": [10, 0]}}
+
+    # `npe2 cache --clear` clears the history too
+    assert mock_reader_stats in _npe1_adapter.clear_cache()
+    assert not mock_reader_stats.exists()
+
+
+def test_read_last_reader_cache(tmp_path):
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+    results = {"a": [(None,)], "b": [(None,)]}
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader_a(path):
+        return lambda path: results["a"]
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy", "*.other"])
+    def get_reader_b(path):
+        return lambda path: results["b"]
+
+    _, rdr = io_utils._read(["x.fzzy"], stack=False, _pm=pm, return_reader=True)
+    assert rdr.command == "plugin.get_reader_a"
+
+    # the same kind of path goes straight to the last successful reader
+    with patch.object(pm, "iter_compatible_readers") as mock:
+        _, rdr = io_utils._read(["y.FZZY"], stack=False, _pm=pm, return_reader=True)
+        assert rdr.command == "plugin.get_reader_a"
+        mock.assert_not_called()
+
+    # ... but falls back to all readers if it returns nothing
+    results["a"] = []
+    _, rdr = io_utils._read(["z.fzzy"], stack=False, _pm=pm, return_reader=True)
+    assert rdr.command == "plugin.get_reader_b"
+    assert pm._contrib.last_reader(["z.fzzy"], False) is rdr
+    assert pm._contrib.last_reader(["z.fzzy"], True) is None
+    assert pm._contrib.last_reader(["z.other"], False) is None
+
+    # changes to the readers clear the cache
+    pm.disable("plugin")
+    pm.enable("plugin")
+    assert pm._contrib.last_reader(["z.fzzy"], False) is None
+
+
+def test_read_lazy():
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+    results = {"lazy": [(None,)]}
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_eager_reader(path):
+        return lambda path: [(None,)]
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"], lazy=True)
+    def get_lazy_reader(path):
+        return lambda path: results["lazy"]
+
+    def _read(lazy):
+        _, rdr = io_utils._read(
+            ["x.fzzy"], stack=False, lazy=lazy, _pm=pm, return_reader=True
+        )
+        return rdr.command
+
+    assert _read(lazy=False) == "plugin.get_eager_reader"
+    assert _read(lazy=True) == "plugin.get_lazy_reader"
+    assert _read(lazy=False) == "plugin.get_eager_reader"
+
+    # eager readers are still tried if no lazy reader returns data
+    results["lazy"] = []
+    assert _read(lazy=True) == "plugin.get_eager_reader"
+
+
+def test_read_timeout():
+    import threading
+
+    from npe2 import _reader_stats
+
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+    release = threading.Event()
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_slow_reader(path):
+        release.wait(5)
+        return lambda path: [(None,)]
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_fast_reader(path):
+        return lambda path: [(None,)]
+
+    try:
+        with pytest.warns(UserWarning, match="did not return within"):
+            _, rdr = io_utils._read(
+                ["x.fzzy"], stack=False, timeout=0.05, _pm=pm, return_reader=True
+            )
+    finally:
+        release.set()
+    assert rdr.command == "plugin.get_fast_reader"
+    assert _reader_stats._get()[".fzzy"]["plugin.get_slow_reader"] == [0, 1]
+
+    # exceptions raised by readers still propagate
+    @plugin.contribute.reader(filename_patterns=["*.bad"])
+    def get_bad_reader(path):
+        raise OSError("bad file")
+
+    with pytest.raises(OSError, match="bad file"):
+        io_utils._read(["x.bad"], stack=False, timeout=1, _pm=pm)
+
+    # ... including `TimeoutError` (which is not an expired time budget)
+    @plugin.contribute.reader(filename_patterns=["*.url"])
+    def get_url_reader(path):
+        raise TimeoutError("timed out")
+
+    with pytest.raises(TimeoutError, match="timed out"):
+        io_utils._read(["x.url"], stack=False, timeout=5, _pm=pm)
+
+
+def test_read_many(uses_sample_plugin):
+    paths = ["a.fzzy", "b.nope", "c.fzzy"]
+    results = list(read_many(iter(paths), max_workers=1))
+    assert [r[0] for r in results] == paths
+    for path, data, reader in results:
+        if path == "b.nope":
+            assert isinstance(data, ValueError)
+            assert reader is None
+        else:
+            assert data == [(None,)]
+            assert reader.command == f"{SAMPLE_PLUGIN_NAME}.some_reader"
+
+    # the paths are consumed lazily, and closing the generator stops reading
+    consumed = []
+
+    def _paths():
+        for i in range(100):
+            consumed.append(i)
+            yield f"{i}.fzzy"
+
+    gen = read_many(_paths(), max_workers=2)
+    next(gen)
+    gen.close()
+    assert len(consumed) <= 5
+
+
+def test_read_many_resolves_readers_once(mock_reader_stats):
+    pm = PluginManager()
+    first = DynamicPlugin("first", plugin_manager=pm)
+    second = DynamicPlugin("second", plugin_manager=pm)
+    calls = []
+
+    @first.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader_first(path):
+        calls.append("first")
+        return None
+
+    @second.contribute.reader(filename_patterns=["*.fzzy", "*.other"])
+    def get_reader_second(path):
+        calls.append("second")
+        return lambda path: [(path,)]
+
+    paths = [f"{i}.fzzy" for i in range(20)] + ["a.other", "b.other"]
+    with patch.object(io_utils, "_iter_readers", wraps=io_utils._iter_readers) as it:
+        results = list(read_many(paths, max_workers=4, _pm=pm))
+    assert [data for _, data, _ in results] == [[(p,)] for p in paths]
+    assert {r.plugin_name for _, _, r in results} == {"second"}
+    # once per kind of path, and the failing reader is only tried once
+    assert it.call_count == 2
+    assert calls.count("first") == 1
+
+
+def test_read_many_patterns(mock_reader_stats):
+    # paths with the same extension may still have different compatible readers
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+
+    @plugin.contribute.reader(filename_patterns=["*.fzzy"])
+    def get_reader_any(path):
+        return None
+
+    @plugin.contribute.reader(filename_patterns=["special_*.fzzy"])
+    def get_reader_special(path):
+        return lambda path: [(path,)]
+
+    paths = ["a.fzzy", "special_b.fzzy", "special_c.fzzy"]
+    results = list(read_many(paths, max_workers=2, _pm=pm))
+    assert isinstance(results[0][1], ValueError)
+    assert [data for _, data, _ in results[1:]] == [[(p,)] for p in paths[1:]]
+
+
 def test_read_return_reader(uses_sample_plugin):
     data, reader = read_get_reader("some.fzzy")
     assert data == [(None,)]
@@ -93,6 +344,88 @@ def test_writer_exec(uses_sample_plugin):
     assert contrib.command == f"{SAMPLE_PLUGIN_NAME}.my_writer"
 
 
+def test_streaming_writer():
+    np = pytest.importorskip("numpy")
+
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+    written = []
+
+    @plugin.contribute.writer(
+        filename_extensions=[".x"], layer_types=["image"], streaming=True
+    )
+    def write_chunks(path, data, meta):
+        assert isinstance(data, ChunkedData)
+        out = np.empty(data.shape, data.dtype)
+        for index, chunk in data:
+            out[index] = chunk
+        written.append(out)
+        return [path]
+
+    data = np.arange(24, dtype="uint8").reshape(6, 4)
+    assert io_utils._write("a.x", [(data, {}, "image")], _pm=pm) == ["a.x"]
+    np.testing.assert_array_equal(written[0], data)
+
+    chunked = ChunkedData(data, chunk_bytes=8)  # two rows per chunk
+    assert len(chunked) == 3
+    index, chunk = next(iter(chunked))
+    assert index == (slice(0, 2), slice(0, 4))
+    assert np.shares_memory(chunk, data)  # numpy arrays are not copied
+    assert [i for i, _ in ChunkedData(np.float32(1))] == [()]
+
+
+def test_write_converts_layers_lazily():
+    class Image:
+        _type_string = "image"
+        as_layer_data_tuple = Mock(return_value=null_image)
+
+    pm = PluginManager()
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+
+    @plugin.contribute.writer(filename_extensions=[".x"], layer_types=["image"])
+    def write_image(path, data, meta):
+        return [path]
+
+    # no conversion when no writer is found
+    with pytest.raises(ValueError, match="No writer found"):
+        io_utils._write("a.x", [Image(), Image()], _pm=pm)
+    Image.as_layer_data_tuple.assert_not_called()
+
+    assert io_utils._write("a.x", [Image()], _pm=pm) == ["a.x"]
+    Image.as_layer_data_tuple.assert_called_once()
+
+
+def test_convert_does_not_copy(monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    pm = PluginManager()
+    monkeypatch.setattr(PluginManager, "instance", lambda: pm)
+    plugin = DynamicPlugin("plugin", plugin_manager=pm)
+    data = np.zeros((4, 4))
+    written = []
+
+    @plugin.contribute.reader(filename_patterns=["*.src"])
+    def get_reader(path):
+        return lambda path: [(data,)]
+
+    @plugin.contribute.writer(filename_extensions=[".dst"], layer_types=["image"])
+    def write_image(path, data, meta):
+        written.append(data)
+        return [path]
+
+    assert convert("a.src", "b.dst") == ["b.dst"]
+    assert written[0] is data
+
+    layer = LayerDataTuple.from_layer_data((data,))
+    assert layer == (data, {}, "image")
+    assert LayerDataTuple.from_layer_data(layer) is layer
+    (buffer,) = layer.buffers()
+    assert np.shares_memory(np.asarray(buffer), data)
+
+    with pytest.raises(ValueError, match="No readers returned data"):
+        convert("a.other", "b.dst")
+
+
 @pytest.mark.parametrize("layer_data", [[null_image, null_image], []])
 def test_writer_exec_fails(layer_data, uses_sample_plugin):
     # the sample writer doesn't accept no extension
@@ -1,6 +1,8 @@
 import json
+import os
 from functools import partial
-from unittest.mock import Mock
+from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -82,6 +84,57 @@ def test_writer_valid_layer_type_expressions(expr, uses_sample_plugin):
     PluginManifest(**data)
 
 
+def test_writer_layer_type_constraints_cached():
+    from npe2.manifest.contributions import LayerType, WriterContribution
+    from npe2.manifest.contributions._writers import LayerTypeConstraint
+
+    constraint = LayerTypeConstraint.from_str("image+")
+    assert LayerTypeConstraint.from_str("image+") is constraint
+    with pytest.raises(TypeError):
+        constraint.bounds = (0, 1)  # shared instances are immutable
+    writer = WriterContribution(command="a.b", layer_types=["image+", "points?"])
+    constraints = writer.layer_type_constraints()
+    assert [c.layer_type for c in constraints] == [
+        LayerType.image,
+        LayerType.points,
+        *(lt for lt in LayerType if lt not in ("image", "points")),
+    ]
+    with patch.object(LayerTypeConstraint, "_parse") as mock:
+        assert writer.layer_type_constraints() == constraints
+        mock.assert_not_called()
+
+    writer.layer_types = ["labels"]  # changing layer_types invalidates the cache
+    assert writer.layer_type_constraints()[0].layer_type == LayerType.labels
+
+
+def test_writer_index_memo():
+    """Memoized writer matches must be invalidated when plugins change."""
+    pm = PluginManager()
+
+    def write(path, data):
+        ...
+
+    for i, layer_types in enumerate([["image*"], ["image+", "points?"]]):
+        plugin = DynamicPlugin(f"plugin-{i}", plugin_manager=pm)
+        plugin.register()
+        contribute = plugin.contribute.writer(
+            filename_extensions=[".x"], layer_types=layer_types
+        )
+        contribute(write)
+
+    def _commands(layer_types):
+        return [w.command for w in pm.iter_compatible_writers(layer_types)]
+
+    assert _commands(["image", "points"]) == ["plugin-1.write"]
+    assert _commands(["points", "image"]) == ["plugin-1.write"]
+    assert _commands(["image"]) == ["plugin-0.write", "plugin-1.write"]
+    assert _commands(["image", "labels"]) == []
+    assert _commands(["image", "not-a-layer-type"]) == _commands(["image"])
+
+    pm.unregister("plugin-0")
+    assert _commands(["image"]) == ["plugin-1.write"]
+
+
 def test_basic_iter_reader(uses_sample_plugin, plugin_manager: PluginManager, tmp_path):
     tmp_path = str(tmp_path)
     assert not list(plugin_manager.iter_compatible_readers(""))
@@ -95,6 +148,56 @@ def test_basic_iter_reader(uses_sample_plugin, plugin_manager: PluginManager, tm
         list(plugin_manager.iter_compatible_readers(["a.tif", "b.jpg"]))
 
 
+def test_reader_index_matches_fnmatch():
+    """The reader index must give the same results as fnmatch, in order."""
+    from fnmatch import fnmatch
+
+    pm = PluginManager()
+    patterns = [
+        ["*.tif", "*.tiff"],
+        ["*.ome.tif", "*.OME.TIFF"],
+        ["*.tar.gz"],
+        ["*"],
+        ["http://*", "https://*"],
+        ["*.[ch]", "data_??.npy"],
+        ["*.tif"],
+    ]
+
+    def get_reader(path):
+        ...
+
+    for i, pats in enumerate(patterns):
+        plugin = DynamicPlugin(f"plugin-{i}", plugin_manager=pm)
+        plugin.register()
+        plugin.contribute.reader(filename_patterns=pats)(get_reader)
+
+    paths = [
+        "a.tif",
+        "some/dir.tif/a.TIF",
+        "a.ome.tif",
+        "A.OME.TIFF",
+        "x.tar.gz",
+        "x.gz",
+        "noext",
+        "http://site.com/a.tif",
+        "src/main.c",
+        "data_01.npy",
+        "data_001.npy",
+    ]
+    for path in paths:
+        lower = path
+        if not path.startswith("http"):  # extensions are lower-cased, except URIs
+            base = os.path.splitext(Path(path).stem)[0]
+            lower = base + "".join(Path(path).suffixes).lower()
+        expected = [
+            r
+            for mf in pm.iter_manifests()
+            for r in mf.contributions.readers or ()
+            if any(fnmatch(lower, p.lower()) for p in r.filename_patterns)
+        ]
+        assert list(pm.iter_compatible_readers(path)) == expected, path
+
+
 def test_widgets(uses_sample_plugin, plugin_manager: PluginManager):
     widgets = list(plugin_manager.iter_widgets())
     assert len(widgets) == 2
@@ -1,8 +1,12 @@
+import os
+import sys
 from importlib import metadata
 from pathlib import Path
+from timeit import timeit
 from unittest.mock import patch
 
 import pytest
+import yaml
 from pydantic import ValidationError
 
 from npe2 import PluginManifest
@@ -44,7 +48,38 @@ def test_discover(uses_sample_plugin):
     assert error is None
 
 
-def test_discover_errors(tmp_path: Path):
+def test_discover_index(uses_sample_plugin, sample_path, mock_discovery_index):
+    from npe2.manifest import schema
+
+    mock_discovery_index.unlink(missing_ok=True)
+    with patch.object(
+        schema, "_discover_distributions", wraps=schema._discover_distributions
+    ) as mock:
+        [first] = PluginManifest.discover()
+        mock.assert_called_once()
+        assert mock_discovery_index.exists()
+
+        # nothing changed in the environment: the index is used
+        mock.reset_mock()
+        [second] = PluginManifest.discover()
+        mock.assert_not_called()
+        assert second.manifest == first.manifest
+        assert second.manifest.package_metadata == first.manifest.package_metadata
+        assert second.distribution.metadata["Name"] == SAMPLE_PLUGIN_NAME
+
+        # touching a dist-info directory invalidates the index
+        dist_info = sample_path / "my_plugin-1.2.3.dist-info"
+        st = dist_info.stat()
+        os.utime(dist_info, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        try:
+            list(PluginManifest.discover())
+            mock.assert_called_once()
+        finally:
+            os.utime(dist_info, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_discover_errors(tmp_path: Path, workers):
     """testing various discovery errors"""
     # package with proper `napari.manifest` entry_point, but invalid pointer to
     # a manifest should yield an error in results
@@ -76,7 +111,9 @@ def test_discover_errors(tmp_path: Path):
     ]
 
     with patch.object(metadata, "distributions", return_value=dists):
-        discover_results = list(PluginManifest.discover(paths=[tmp_path]))
+        discover_results = list(
+            PluginManifest.discover(paths=[tmp_path], workers=workers)
+        )
 
     assert len(discover_results) == 2
     res_a, res_b = discover_results
@@ -91,6 +128,69 @@ def test_discover_errors(tmp_path: Path):
     assert isinstance(res_b.error, ValidationError)
 
 
+def test_threaded_discover_yields_progressively():
+    import threading
+
+    from npe2.manifest import schema
+
+    release = threading.Event()
+
+    def _discover(dist):
+        if dist == "b":  # still parsing when the first result is consumed
+            assert release.wait(5)
+        return dist
+
+    with patch.object(metadata, "distributions", return_value=["a", "b"]), patch.object(
+        schema, "_has_plugin_entry_point", return_value=True
+    ), patch.object(schema, "_discover_distribution", _discover):
+        results = schema._discover_distributions(workers=2)
+        assert next(results) == "a"
+        release.set()
+        assert list(results) == ["b"]
+
+
+def test_discover_does_not_import_plugin(tmp_path: Path):
+    pkg = tmp_path / "heavy_pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("raise RuntimeError('plugin was imported!')")
+    (pkg / "sub" / "__init__.py").touch()
+    (pkg / "sub" / "napari.yaml").write_text("name: heavy-plugin")
+    dist_info = tmp_path / "heavy_plugin-0.1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: heavy-plugin\nVersion: 0.1.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[napari.manifest]\nheavy-plugin = heavy_pkg.sub:napari.yaml\n"
+    )
+
+    [result] = PluginManifest.discover(paths=[tmp_path])
+    assert result.error is None
+    assert result.manifest and result.manifest.name == "heavy-plugin"
+    assert result.manifest.package_version == "0.1.0"
+    assert "heavy_pkg" not in sys.modules
+
+
+def test_discover_skips_non_plugins(tmp_path: Path):
+    from npe2.manifest import schema
+
+    plugin = tmp_path / "plugin"
+    plugin.mkdir()
+    (plugin / "entry_points.txt").write_text("[napari.plugin]\nsome = some_module")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "entry_points.txt").write_text("[console_scripts]\nsomething = a:b")
+    no_eps = tmp_path / "no_eps"
+    no_eps.mkdir()
+
+    dists = [metadata.PathDistribution(p) for p in (plugin, other, no_eps)]
+    with patch.object(metadata, "distributions", return_value=dists):
+        with patch.object(schema, "_from_dist", return_value=None) as mock:
+            list(PluginManifest.discover())
+    # only the distribution declaring a napari entry point is fully inspected
+    mock.assert_called_once_with(dists[0])
+
+
 def test_package_meta(uses_sample_plugin):
     direct_meta = PackageMetadata.for_package(SAMPLE_PLUGIN_NAME)
     assert direct_meta.name == SAMPLE_PLUGIN_NAME
@@ -106,6 +206,31 @@ def test_package_meta(uses_sample_plugin):
     assert manifest.license == direct_meta.license == "BSD-3"
 
 
+def test_lazy_package_meta(uses_sample_plugin):
+    with patch.object(
+        metadata, "distribution", wraps=metadata.distribution
+    ) as mock_dist:
+        mf = PluginManifest(name=SAMPLE_PLUGIN_NAME)
+        mf.display_name = "Some Plugin"  # reading/setting other fields: no lookup
+        assert mf.name == SAMPLE_PLUGIN_NAME
+        mock_dist.assert_not_called()
+
+        assert mf.package_version == "1.2.3"
+        assert mf.package_metadata == PackageMetadata.for_package(SAMPLE_PLUGIN_NAME)
+        assert mf.dict()["package_metadata"]["version"] == "1.2.3"
+        # resolved only once
+        mock_dist.assert_called_once_with(SAMPLE_PLUGIN_NAME)
+
+        # resolved by `dict()` as well
+        mf2 = PluginManifest(name=SAMPLE_PLUGIN_NAME)
+        assert mf2.dict()["package_metadata"]["version"] == "1.2.3"
+
+        # explicitly provided metadata is never overwritten
+        meta = PackageMetadata(name=SAMPLE_PLUGIN_NAME, version="0.0.1")
+        mf3 = PluginManifest(name=SAMPLE_PLUGIN_NAME, package_metadata=meta)
+        assert mf3.package_version == "0.0.1"
+
+
 def test_all_package_meta():
     """make sure PackageMetadata works for whatever packages are in the environment.
 
@@ -127,6 +252,95 @@ def test_export_round_trip(sample_manifest, tmp_path, format):
     assert sample_manifest == PluginManifest.from_file(out_file)
 
 
+def test_from_file_compiled_cache(sample_manifest, tmp_path, mock_compiled_cache):
+    from npe2.manifest import _bases
+
+    mf_file = tmp_path / "napari.yaml"
+    mf_file.write_text(sample_manifest.yaml())
+    first = PluginManifest.from_file(mf_file)
+    assert list(mock_compiled_cache.iterdir())
+
+    # unchanged file: neither parsed nor validated again
+    with patch.object(_bases.yaml, "load") as load:
+        with patch.object(PluginManifest, "__init__") as init:
+            second = PluginManifest.from_file(mf_file)
+    load.assert_not_called()
+    init.assert_not_called()
+    assert second == first
+    assert second is not first
+    assert second._source_file == first._source_file
+
+    # modified file: the cache is invalidated
+    mf_file.write_text(sample_manifest.yaml().replace("My Plugin", "New Name"))
+    assert PluginManifest.from_file(mf_file).display_name == "New Name"
+
+
+def test_cache_file_concurrent_saves(tmp_path, monkeypatch):
+    import pickle
+    import threading
+
+    from npe2.manifest import _bases
+
+    monkeypatch.delenv(_bases.NPE2_NOCACHE, raising=False)
+    cache = tmp_path / "cache"
+    barrier = threading.Barrier(8)
+
+    def _save(i):
+        barrier.wait()
+        _bases.save_cache_file(cache, pickle.dumps(i))
+
+    threads = [threading.Thread(target=_save, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # one of the saves won, and no temporary file was left behind
+    assert _bases.load_cache_file(cache, pickle.load) in range(8)
+    assert list(tmp_path.iterdir()) == [cache]
+
+    cache.write_bytes(b"corrupt")
+    assert _bases.load_cache_file(cache, pickle.load) is None
+
+
+YAML_MANIFESTS = [
+    Path(__file__).parent.parent / "_docs" / "example_manifest.yaml",
+    Path(__file__).parent / "sample" / "my_plugin" / "napari.yaml",
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+@pytest.mark.parametrize("path", YAML_MANIFESTS, ids=lambda p: p.parent.name)
+def test_libyaml(path: Path):
+    """The libyaml loader/dumper used by npe2 must match the pure python ones."""
+    from npe2.manifest import _bases
+
+    assert _bases.SafeLoader is yaml.CSafeLoader
+    assert _bases.SafeDumper is yaml.CSafeDumper
+
+    text = path.read_text()
+    data = yaml.load(text, Loader=yaml.SafeLoader)
+    assert _bases.yaml_load(text) == data
+    assert _bases.yaml_dump(data) == yaml.safe_dump(data, sort_keys=False)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+@pytest.mark.parametrize("path", YAML_MANIFESTS, ids=lambda p: p.parent.name)
+def test_libyaml_benchmark(path: Path, record_property):
+    """Compare the speed of the libyaml loader/dumper with the pure python ones."""
+    from npe2.manifest import _bases
+
+    text = path.read_text()
+    data = yaml.load(text, Loader=yaml.SafeLoader)
+    n = 20
+    py_load = timeit(lambda: yaml.load(text, Loader=yaml.SafeLoader), number=n)
+    c_load = timeit(lambda: _bases.yaml_load(text), number=n)
+    py_dump = timeit(lambda: yaml.safe_dump(data, sort_keys=False), number=n)
+    c_dump = timeit(lambda: _bases.yaml_dump(data), number=n)
+    record_property("load_speedup", py_load / c_load)
+    record_property("dump_speedup", py_dump / c_dump)
+
+
 def test_from_distribution(uses_sample_plugin):
     mf = PluginManifest.from_distribution(SAMPLE_PLUGIN_NAME)
     assert mf.name == SAMPLE_PLUGIN_NAME
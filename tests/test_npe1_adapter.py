@@ -60,6 +60,23 @@ def test_npe1_adapter(uses_npe1_plugin, mock_cache: Path):
         mock.assert_not_called()
 
 
+def test_npe1_adapter_listed_without_indexing(uses_npe1_plugin, mock_cache: Path):
+    pm = PluginManager()
+    pm.discover(include_npe1=True)
+    samples = dict(pm.iter_sample_data())
+    assert samples["npe1-plugin"]
+
+    # listing contributions does not index the adapter
+    assert len(pm._npe1_adapters) == 1
+    assert "npe1-plugin" not in pm._contrib._indexed
+    assert not list(pm.iter_compatible_readers("x.abc"))
+
+    pm.index_npe1_adapters()
+    assert "npe1-plugin" in pm._contrib._indexed
+    assert list(pm.iter_compatible_readers("x.abc"))
+    assert dict(pm.iter_sample_data()) == samples
+
+
 def test_npe1_adapter_cache(uses_npe1_plugin, mock_cache: Path):
     """Test that we can clear cache, etc.."""
     pm = PluginManager()
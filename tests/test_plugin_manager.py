@@ -40,6 +40,120 @@ def test_discover_clear(uses_sample_plugin):
         reg_mock.assert_called_once_with({pm._manifests[SAMPLE_PLUGIN_NAME]})
 
 
+def test_discover_with_workers(sample_path):
+    pm = PluginManager()
+    sys.path.append(str(sample_path))
+    try:
+        assert pm.discover(workers=4) == 1
+    finally:
+        sys.path.remove(str(sample_path))
+    assert SAMPLE_PLUGIN_NAME in pm
+
+
+def test_discover_async(sample_path):
+    pm = PluginManager()
+    results = []
+    sys.path.append(str(sample_path))
+    try:
+        future = pm.discover_async(callback=results.append)
+        assert future.result(timeout=30) == 1
+    finally:
+        sys.path.remove(str(sample_path))
+    assert SAMPLE_PLUGIN_NAME in pm
+    assert SAMPLE_PLUGIN_NAME in [r.manifest.name for r in results if r.manifest]
+
+
+def test_iter_manifests_during_discover_async(sample_path):
+    """Manifests may be listed while `discover_async` registers plugins."""
+    pm = PluginManager()
+    manifests = [PluginManifest(name=f"plugin-{i}") for i in range(50)]
+
+    def _churn(result):  # (more registrations, while discovery runs)
+        for _ in range(50):
+            pm.register_many(manifests)
+            pm.unregister_many(mf.name for mf in manifests)
+
+    sys.path.append(str(sample_path))
+    try:
+        future = pm.discover_async(callback=_churn)
+        while not future.done():
+            names = [mf.name for mf in pm.iter_manifests()]
+            assert len(names) == len(set(names))
+            pm.dict(exclude={"contributions", "package_metadata"})
+        assert future.result() == 1
+    finally:
+        sys.path.remove(str(sample_path))
+    assert [mf.name for mf in pm.iter_manifests()] == [SAMPLE_PLUGIN_NAME]
+
+
+def test_events_emitted_outside_of_lock(sample_path):
+    """Event handlers may wait for other threads that use the plugin manager."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    pm = PluginManager()
+    pool = ThreadPoolExecutor(1)
+    acquired = []
+
+    def _wait_for_other_thread(*_):  # (e.g. a GUI handler, waiting for main thread)
+        def _acquire():
+            if ok := pm._lock.acquire(timeout=2):
+                pm._lock.release()
+            return ok
+
+        acquired.append(pool.submit(_acquire).result())
+
+    pm.events.plugins_registered.connect(_wait_for_other_thread)
+    pm.events.activation_changed.connect(_wait_for_other_thread)
+    sys.path.append(str(sample_path))
+    try:
+        assert pm.discover_async().result() == 1
+        pm.activate(SAMPLE_PLUGIN_NAME)
+        pm.unregister(SAMPLE_PLUGIN_NAME)
+    finally:
+        sys.path.remove(str(sample_path))
+        pool.shutdown()
+    assert acquired == [True] * 3  # registered, activated, deactivated
+
+
+def test_concurrent_index_reads(uses_sample_plugin, plugin_manager: PluginManager):
+    """The index may be read while plugins are (un)registered in another thread."""
+    import threading
+
+    manifests = [
+        PluginManifest(
+            name=f"plugin-{i}",
+            contributions={
+                "commands": [{"id": f"plugin-{i}.read", "title": "read"}],
+                "readers": [
+                    {"command": f"plugin-{i}.read", "filename_patterns": ["*.fzy"]}
+                ],
+                "themes": [
+                    {"label": f"{i}", "id": f"{i}", "type": "dark", "colors": {}}
+                ],
+            },
+        )
+        for i in range(20)
+    ]
+    done = threading.Event()
+
+    def _churn():
+        for _ in range(20):
+            plugin_manager.register_many(manifests)
+            plugin_manager.unregister_many(mf.name for mf in manifests)
+        done.set()
+
+    thread = threading.Thread(target=_churn)
+    thread.start()
+    while not done.is_set():
+        readers = [r.command for r in plugin_manager.iter_compatible_readers("a.fzy")]
+        assert f"{SAMPLE_PLUGIN_NAME}.some_reader" in readers
+        assert list(plugin_manager.iter_compatible_writers(["image", "image"]))
+        assert "SampleTheme" in [t.label for t in plugin_manager.iter_themes()]
+        plugin_manager.menus()
+        assert SAMPLE_PLUGIN_NAME in [mf.name for mf in plugin_manager.iter_manifests()]
+    thread.join()
+
+
 def test_plugin_manager(pm: PluginManager):
     assert pm.get_command(f"{SAMPLE_PLUGIN_NAME}.hello_world")
 
@@ -136,6 +250,43 @@ def test_command_reg_get():
     assert reg.execute("id", (1, 2)) == 3
 
 
+def test_command_reg_negative_cache(monkeypatch):
+    from npe2 import _command_registry
+    from npe2.manifest import utils
+
+    reg = CommandRegistry()
+    reg.register("bad.cmd", "not_a_real_module_xyz:func")
+    reg.register("good.cmd", "os.path:join")
+    with patch.object(utils, "import_python_name", wraps=utils.import_python_name) as m:
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="Failed to import command"):
+                reg.get("bad.cmd")
+        m.assert_called_once()  # failure is cached
+
+        monkeypatch.setattr(_command_registry, "IMPORT_RETRY_DELAY", 0)
+        with pytest.raises(RuntimeError):
+            reg.get("bad.cmd")
+        assert m.call_count == 2
+
+        assert reg.get("good.cmd") is reg.get("good.cmd")
+
+    stats = reg.stats()
+    assert stats["bad.cmd"].import_failures == 2
+    assert stats["bad.cmd"].import_time is None
+    assert stats["good.cmd"].import_failures == 0
+    assert stats["good.cmd"].import_time is not None
+
+
+def test_command_stats_activation(uses_sample_plugin):
+    pm = PluginManager.instance()
+    pm.deactivate(SAMPLE_PLUGIN_NAME)
+    reg = pm.commands
+    reg.get(f"{SAMPLE_PLUGIN_NAME}.some_reader")
+    stats = reg.stats()[f"{SAMPLE_PLUGIN_NAME}.some_reader"]
+    assert stats.activation_time is not None
+    assert stats.import_time is not None
+
+
 def _assert_sample_enabled(plugin_manager: PluginManager, enabled=True):
     i = SAMPLE_PLUGIN_NAME in plugin_manager._contrib._indexed
     assert i if enabled else not i
@@ -222,3 +373,217 @@ def test_plugin_context_dispose():
     pm.get_context("test").register_disposable(mock)
     pm.deactivate("test")
     mock.assert_called_once()
+
+
+def test_contributions_index_order():
+    """Listed contributions stay in registration order across enable/disable."""
+    pm = PluginManager()
+    for name in ("a", "b", "c"):
+        mf = PluginManifest(
+            name=name,
+            contributions={
+                "commands": [{"id": f"{name}.cmd", "title": "cmd"}],
+                "menus": {"some/menu": [{"command": f"{name}.cmd"}]},
+                "submenus": [{"id": "sub", "label": name}],
+                "themes": [{"label": name, "id": name, "type": "dark", "colors": {}}],
+            },
+        )
+        pm.register(mf)
+
+    def _labels():
+        return [t.label for t in pm.iter_themes()]
+
+    assert _labels() == ["a", "b", "c"]
+    pm.disable("a")
+    assert _labels() == ["b", "c"]
+    assert pm.get_submenu("sub").label == "b"
+    pm.enable("a")
+    assert _labels() == ["a", "b", "c"]
+    assert pm.get_submenu("sub").label == "a"
+    assert [i.command for i in pm.iter_menu("some/menu")] == ["a.cmd", "b.cmd", "c.cmd"]
+    assert list(pm.menus()) == ["some/menu"]
+
+    # re-registering goes to the end
+    mf = pm["a"]
+    pm.unregister("a")
+    pm.register(mf)
+    assert _labels() == ["b", "c", "a"]
+    pm.unregister("b")
+    pm.unregister("c")
+    pm.unregister("a")
+    assert pm.menus() == {}
+    with pytest.raises(KeyError):
+        pm.get_submenu("sub")
+
+
+def test_remove_contributions_leaves_nothing(uses_sample_plugin, plugin_manager):
+    """Removing a plugin must remove exactly what indexing it added."""
+    contrib = plugin_manager._contrib
+    other = PluginManifest(
+        name="other", contributions={"commands": [{"id": "other.c", "title": "c"}]}
+    )
+    plugin_manager.register(other)
+    plugin_manager.disable(SAMPLE_PLUGIN_NAME)
+    assert list(contrib._commands) == ["other.c"]
+    assert not contrib._readers._exts and not contrib._readers._globs
+    assert not contrib._readers._dirs and not contrib._readers._owned
+    assert not contrib._writers._entries and not contrib._writers._owned
+    assert not contrib._menus and not contrib._submenus
+    assert not contrib._themes and not contrib._widgets and not contrib._samples
+
+    plugin_manager.enable(SAMPLE_PLUGIN_NAME)
+    _assert_sample_enabled(plugin_manager)
+
+
+def test_remove_contributions_in_place():
+    """Removing a plugin does not copy what other plugins contributed."""
+    manifests = [
+        PluginManifest(
+            name=f"p{i}",
+            contributions={
+                "commands": [{"id": f"p{i}.c", "title": "c"}],
+                "readers": [
+                    {"command": f"p{i}.c", "filename_patterns": ["*.tif", "p*.x"]}
+                ],
+                "writers": [{"command": f"p{i}.c", "layer_types": ["image"]}],
+                "themes": [{"label": "t", "id": "t", "type": "dark", "colors": {}}],
+                "menus": {"some/menu": [{"command": f"p{i}.c"}]},
+            },
+        )
+        for i in range(3)
+    ]
+    pm = PluginManager()
+    pm.register_many(manifests)
+    contrib = pm._contrib
+
+    def _containers():
+        return [
+            pm._manifests,
+            contrib._commands,
+            contrib._readers._exts["tif"],
+            contrib._readers._globs,
+            contrib._writers._entries,
+            contrib._themes,
+            contrib._menus["some/menu"],
+        ]
+
+    before = _containers()
+    pm.unregister("p1")
+    pm.disable("p2")
+    pm.enable("p2")  # (still listed last: nothing is reordered)
+    assert all(a is b for a, b in zip(_containers(), before))
+    assert [r.command for r in pm.iter_compatible_readers("p.x")] == ["p0.c", "p2.c"]
+    assert [i.command for i in pm.iter_menu("some/menu")] == ["p0.c", "p2.c"]
+    assert len(list(pm.iter_compatible_writers(["image"]))) == 2
+
+
+def test_register_many_indexes_once():
+    """register_many gathers all contributions, then updates each container once."""
+    manifests = [
+        PluginManifest(
+            name=f"p{i}",
+            contributions={
+                "commands": [{"id": f"p{i}.c", "title": "c"}],
+                "readers": [{"command": f"p{i}.c", "filename_patterns": ["*.tif"]}],
+                "writers": [{"command": f"p{i}.c", "layer_types": ["image"]}],
+                "themes": [{"label": "t", "id": "t", "type": "dark", "colors": {}}],
+                "menus": {"some/menu": [{"command": f"p{i}.c"}]},
+            },
+        )
+        for i in range(4)
+    ]
+    pm = PluginManager()
+    pm.register(manifests[0])
+    contrib = pm._contrib
+    with patch.object(
+        contrib._readers, "add", wraps=contrib._readers.add
+    ) as add_readers, patch.object(
+        contrib._writers, "add", wraps=contrib._writers.add
+    ) as add_writers, patch.object(
+        contrib, "_add", wraps=contrib._add
+    ) as add_bucket:
+        pm.register_many(manifests[1:])
+    assert add_readers.call_count == add_writers.call_count == 1
+    assert add_bucket.call_count == 2  # (the theme and the menu buckets)
+
+    commands = [f"p{i}.c" for i in range(4)]
+    assert [r.command for r in pm.iter_compatible_readers("a.tif")] == commands
+    assert [i.command for i in pm.iter_menu("some/menu")] == commands
+    assert [w.command for w in pm.iter_compatible_writers(["image"])] == commands
+    assert list(contrib._themes) == [mf.name for mf in manifests]
+
+
+def test_register_many():
+    pm = PluginManager()
+    reg_mock = Mock()
+    pm.events.plugins_registered.connect(reg_mock)
+    manifests = [PluginManifest(name=f"plugin-{i}") for i in range(5)]
+    pm.register_many(manifests)
+    reg_mock.assert_called_once_with(set(manifests))
+    assert list(pm._manifests) == [mf.name for mf in manifests]
+
+    # conflicts are checked before anything is registered
+    new = PluginManifest(name="new")
+    with pytest.raises(ValueError, match="plugin-0"):
+        pm.register_many([new, PluginManifest(name="plugin-0")])
+    with pytest.raises(ValueError, match="new"):
+        pm.register_many([new, PluginManifest(name="new")])
+    assert "new" not in pm
+
+    with pytest.raises(ValueError, match="not-registered"):
+        pm.unregister_many(["plugin-0", "not-registered"])
+    assert "plugin-0" in pm
+    pm.unregister_many(mf.name for mf in manifests)
+    assert not len(pm)
+
+
+def test_concurrent_activation(uses_sample_plugin, plugin_manager: PluginManager):
+    """on_activate must be called once, even when activating from many threads."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from npe2 import _plugin_manager
+
+    calls = []
+    orig = _plugin_manager._call_python_name
+
+    def _slow_call(python_name, args=()):
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return orig(python_name, args)
+
+    with patch.object(_plugin_manager, "_call_python_name", _slow_call):
+        with ThreadPoolExecutor(8) as pool:
+            contexts = list(
+                pool.map(
+                    lambda _: plugin_manager.activate(SAMPLE_PLUGIN_NAME), range(8)
+                )
+            )
+    assert len(calls) == 1
+    assert all(ctx is contexts[0] and ctx._activated for ctx in contexts)
+
+    # unregistering a plugin forgets its activation lock
+    assert SAMPLE_PLUGIN_NAME in plugin_manager._activation_locks
+    plugin_manager.unregister(SAMPLE_PLUGIN_NAME)
+    assert SAMPLE_PLUGIN_NAME not in plugin_manager._activation_locks
+
+
+def test_prefetch(uses_sample_plugin, plugin_manager: PluginManager):
+    future = plugin_manager.prefetch(plugins=[SAMPLE_PLUGIN_NAME], max_workers=2)
+    assert future.result(timeout=30) == {}
+
+    bad = "not.a_command"
+    future = plugin_manager.prefetch(
+        commands=[f"{SAMPLE_PLUGIN_NAME}.some_reader", bad]
+    )
+    failures = future.result(timeout=30)
+    assert list(failures) == [bad]
+    assert isinstance(failures[bad], KeyError)
+
+    # activated plugins get their commands resolved
+    plugin_manager.activate(SAMPLE_PLUGIN_NAME)
+    assert plugin_manager.prefetch().result(timeout=30) == {}
+    handler = plugin_manager.commands._commands[f"{SAMPLE_PLUGIN_NAME}.some_reader"]
+    assert handler.function is not None
+    assert plugin_manager.prefetch(commands=[]).result() == {}